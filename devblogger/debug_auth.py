@@ -12,31 +12,35 @@ src_dir = Path(__file__).parent / "src"
 if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
-import sys
-sys.path.append('/Users/gabortabi/DEV/devBlogger/devblogger/src')
-
-from config.settings import Settings
-from github.auth import GitHubAuth
 
 def test_auth_flow():
     """Test the authentication flow step by step."""
+    from config.settings import Settings
+    from github.auth import GitHubAuth
+
     print("🔍 Testing GitHub Authentication Flow")
     print("=" * 50)
 
     # Load settings
     try:
-        settings = Settings()
+        settings = Settings.get_cached()
         print("✅ Settings loaded successfully")
     except Exception as e:
         print(f"❌ Error loading settings: {e}")
         return
 
     # Check configuration
+    github_config = settings.get_many([
+        'github.client_id',
+        'github.client_secret',
+        'github.redirect_uri',
+        'github.scope',
+    ])
     print("\n🔧 Configuration Check:")
-    print(f"   Client ID: {settings.get('github.client_id', 'Not set')[:20]}...")
-    print(f"   Client Secret: {'*' * 20 if settings.get('github.client_secret') else 'Not set'}")
-    print(f"   Redirect URI: {settings.get('github.redirect_uri', 'Not set')}")
-    print(f"   Scope: {settings.get('github.scope', 'Not set')}")
+    print(f"   Client ID: {(github_config['github.client_id'] or 'Not set')[:20]}...")
+    print(f"   Client Secret: {'*' * 20 if github_config['github.client_secret'] else 'Not set'}")
+    print(f"   Redirect URI: {github_config['github.redirect_uri'] or 'Not set'}")
+    print(f"   Scope: {github_config['github.scope'] or 'Not set'}")
 
     # Initialize GitHub auth
     try:
@@ -5,34 +5,127 @@ Automated installation and setup for DevBlogger
 """
 
 import sys
-import subprocess
-import platform
 import os
 from pathlib import Path
-import argparse
 
 
-def run_command(command, description, check=True):
-    """Run a shell command with error handling."""
+# Virtual environment layout; os.name cannot change within a process
+_VENV = Path("devblogger-env")
+_VENV_BIN = _VENV / ("Scripts" if os.name == 'nt' else "bin")
+_ACTIVATE = _VENV_BIN / "activate"
+
+# Written as bytes so no newline translation happens (bash rejects CRLF)
+_ACTIVATION_SCRIPT_BYTES = """#!/bin/bash
+# DevBlogger Activation Script
+# This script activates the virtual environment and runs DevBlogger
+
+# Get the directory where this script is located
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+VENV_PATH="$SCRIPT_DIR/devblogger-env"
+
+# Check if virtual environment exists
+if [ ! -d "$VENV_PATH" ]; then
+    echo "❌ Virtual environment not found at $VENV_PATH"
+    echo "Please run the installation script first:"
+    echo "  python install.py"
+    exit 1
+fi
+
+# Activate virtual environment
+echo "🔧 Activating virtual environment..."
+source "$VENV_PATH/bin/activate"
+
+# Check if activation worked
+if [ -z "$VIRTUAL_ENV" ]; then
+    echo "❌ Failed to activate virtual environment"
+    exit 1
+fi
+
+echo "✅ Virtual environment activated: $VIRTUAL_ENV"
+
+# Run DevBlogger
+echo "🚀 Starting DevBlogger..."
+python -m src.main "$@"
+""".encode("utf-8")
+
+_SAMPLE_CONFIG_BYTES = """# DevBlogger Configuration
+# This is a sample configuration file. Copy this to your config directory.
+
+[window]
+width = 1200
+height = 800
+
+[ai_providers.chatgpt]
+api_key = "your-openai-api-key-here"
+model = "gpt-4"
+max_tokens = 2000
+temperature = 0.7
+
+[ai_providers.gemini]
+api_key = "your-google-gemini-api-key-here"
+model = "gemini-pro"
+max_tokens = 2000
+temperature = 0.7
+
+[ai_providers.ollama]
+base_url = "http://localhost:11434"
+model = "llama2"
+max_tokens = 2000
+temperature = 0.7
+
+[blog]
+default_prompt = "Write a concise, informative, and interesting development blog entry based on the provided commit information. Focus on the most significant changes and improvements. Write in first person as if you are the developer describing your work. Keep the tone professional but engaging. Highlight technical achievements, challenges overcome, and the impact of the changes."
+""".encode("utf-8")
+
+
+def run_command(argv, description, check=True, env=None, capture=True):
+    """Run a command (given as an argument list) with error handling."""
+    import subprocess
+
     print(f"🔧 {description}...")
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            argv,
             check=check,
-            capture_output=True,
-            text=True
+            capture_output=capture,  # Otherwise output goes straight to the terminal
+            text=True,
+            env=env
         )
         if result.stdout:
             print(f"   ✅ {result.stdout.strip()}")
         return result
     except subprocess.CalledProcessError as e:
-        print(f"   ❌ Error: {e.stderr.strip()}")
+        if e.stderr:
+            print(f"   ❌ Error: {e.stderr.strip()}")
+        else:
+            print(f"   ❌ Error: command exited with status {e.returncode}")
         if check:
             sys.exit(1)
         return e
 
 
+def venv_environment():
+    """Build the environment variables an activated virtual environment would set."""
+    env = os.environ.copy()
+    env.pop("PYTHONHOME", None)
+    env["VIRTUAL_ENV"] = str(_VENV.resolve())
+    env["PATH"] = f"{_VENV_BIN.resolve()}{os.pathsep}{env.get('PATH', '')}"
+    return env
+
+
+def write_file_bytes(path, data, mode):
+    """Write a file in one call, creating it with the given permissions."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, mode)
+    try:
+        if hasattr(os, "fchmod"):
+            # O_CREAT's mode is masked by the umask and ignored for existing files
+            os.fchmod(fd, mode)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 def check_python_version():
     """Check if Python version is compatible."""
     print("🐍 Checking Python version...")
@@ -46,9 +139,9 @@ def check_python_version():
     print(f"   ✅ Python {version.major}.{version.minor}.{version.micro} is compatible")
 
 
-def check_uv_installation():
-    """Check if UV is installed."""
-    print("🔍 Checking UV installation...")
+def probe_uv_version():
+    """Get the installed UV version, or None if UV is not installed."""
+    import subprocess
 
     try:
         result = subprocess.run(
@@ -57,33 +150,48 @@ def check_uv_installation():
             text=True,
             check=True
         )
-        print(f"   ✅ UV is installed: {result.stdout.strip()}")
-        return True
+        return result.stdout.strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def check_uv_installation(uv_version):
+    """Report the probed UV version, installing UV if it is missing."""
+    print("🔍 Checking UV installation...")
+
+    if uv_version:
+        print(f"   ✅ UV is installed: {uv_version}")
+    else:
         print("   ⚠️  UV is not installed")
         print("   ℹ️  Installing UV...")
         install_uv()
-        return True
+    return True
 
 
 def install_uv():
     """Install UV package manager."""
+    import platform
+
     system = platform.system().lower()
 
     if system == "linux":
+        # The installer is piped from curl, so this step still needs a shell
         run_command(
-            "curl -LsSf https://astral.sh/uv/install.sh | sh",
-            "Installing UV for Linux"
+            ["/bin/sh", "-c", "curl -LsSf https://astral.sh/uv/install.sh | sh"],
+            "Installing UV for Linux",
+            capture=False
         )
     elif system == "darwin":  # macOS
         run_command(
-            "/bin/bash -c \"$(curl -fsSL https://astral.sh/uv/install.sh)\"",
-            "Installing UV for macOS"
+            ["/bin/bash", "-c", "curl -fsSL https://astral.sh/uv/install.sh | sh"],
+            "Installing UV for macOS",
+            capture=False
         )
     elif system == "windows":
         run_command(
-            "powershell -c \"irm https://astral.sh/uv/install.ps1 | iex\"",
-            "Installing UV for Windows"
+            ["powershell", "-c", "irm https://astral.sh/uv/install.ps1 | iex"],
+            "Installing UV for Windows",
+            capture=False
         )
     else:
         print(f"   ❌ Unsupported platform: {system}")
@@ -95,12 +203,13 @@ def create_virtual_environment():
     """Create UV virtual environment and install dependencies."""
     print("📦 Creating virtual environment and installing dependencies...")
 
-    venv_path = Path("devblogger-env")
+    has_pyproject = Path("pyproject.toml").exists()
+    has_reqs = Path("requirements.txt").exists()
 
     # Create virtual environment
     try:
         run_command(
-            "uv venv devblogger-env",
+            ["uv", "venv", str(_VENV)],
             "Creating UV virtual environment"
         )
     except Exception as e:
@@ -110,88 +219,73 @@ def create_virtual_environment():
         # Try creating venv with Python
         try:
             run_command(
-                "python -m venv devblogger-env",
+                [sys.executable, "-m", "venv", str(_VENV)],
                 "Creating virtual environment with Python"
             )
         except Exception as e:
             print(f"   ❌ Failed to create virtual environment: {e}")
             print("   ℹ️  Please create manually:")
-            print("      uv venv devblogger-env")
+            print(f"      uv venv {_VENV}")
             print("      or")
-            print("      python -m venv devblogger-env")
+            print(f"      python -m venv {_VENV}")
             sys.exit(1)
 
+    # Run installers as if the environment were activated; activation only
+    # sets VIRTUAL_ENV and prepends the environment's bin directory to PATH.
+    venv_env = venv_environment()
+
     # Install dependencies into virtual environment
     try:
-        if Path("pyproject.toml").exists():
+        if has_pyproject:
             # Use UV sync to install all dependencies from pyproject.toml
-            # Activate environment first, then run uv sync
-            if os.name == 'nt':  # Windows
-                activate_script = venv_path / "Scripts" / "activate"
-                run_command(
-                    f"{activate_script} && uv sync",
-                    "Installing all dependencies with UV sync"
-                )
+            run_command(
+                ["uv", "sync"],
+                "Installing all dependencies with UV sync",
+                env=venv_env
+            )
 
-                # Also install requirements.txt if it exists (for any additional deps)
-                if Path("requirements.txt").exists():
-                    run_command(
-                        f"{activate_script} && uv pip install -r requirements.txt",
-                        "Installing additional dependencies from requirements.txt"
-                    )
-            else:  # Unix/Linux/Mac
-                activate_script = venv_path / "bin" / "activate"
+            # Also install requirements.txt if it exists (for any additional deps)
+            if has_reqs:
                 run_command(
-                    f"source {activate_script} && uv sync",
-                    "Installing all dependencies with UV sync"
+                    ["uv", "pip", "install", "-r", "requirements.txt"],
+                    "Installing additional dependencies from requirements.txt",
+                    env=venv_env
                 )
-
-                # Also install requirements.txt if it exists (for any additional deps)
-                if Path("requirements.txt").exists():
-                    run_command(
-                        f"source {activate_script} && uv pip install -r requirements.txt",
-                        "Installing additional dependencies from requirements.txt"
-                    )
         else:
             # Fallback to requirements.txt only
-            if os.name == 'nt':  # Windows
-                activate_script = venv_path / "Scripts" / "activate"
-                run_command(
-                    f"{activate_script} && uv pip install -r requirements.txt",
-                    "Installing dependencies with UV pip"
-                )
-            else:  # Unix/Linux/Mac
-                activate_script = venv_path / "bin" / "activate"
-                run_command(
-                    f"source {activate_script} && uv pip install -r requirements.txt",
-                    "Installing dependencies with UV pip"
-                )
+            run_command(
+                ["uv", "pip", "install", "-r", "requirements.txt"],
+                "Installing dependencies with UV pip",
+                env=venv_env
+            )
     except Exception as e:
         print(f"   ⚠️  UV sync/pip failed: {e}")
         print("   ℹ️  Trying with regular pip...")
 
-        # Activate environment and use pip
-        if os.name == 'nt':  # Windows
-            activate_script = venv_path / "Scripts" / "activate"
-            pip_cmd = f"{activate_script} && pip install -e . && pip install -r requirements.txt"
-        else:  # Unix/Linux/Mac
-            activate_script = venv_path / "bin" / "activate"
-            pip_cmd = f"source {activate_script} && pip install -e . && pip install -r requirements.txt"
+        venv_python = _VENV_BIN / ("python.exe" if os.name == 'nt' else "python")
 
         try:
-            run_command(
-                pip_cmd,
-                "Installing dependencies with pip"
-            )
+            if has_pyproject:
+                run_command(
+                    [str(venv_python), "-m", "pip", "install", "-e", "."],
+                    "Installing package with pip",
+                    env=venv_env
+                )
+            if has_reqs:
+                run_command(
+                    [str(venv_python), "-m", "pip", "install", "-r", "requirements.txt"],
+                    "Installing dependencies with pip",
+                    env=venv_env
+                )
         except Exception as e:
             print(f"   ❌ Failed to install dependencies: {e}")
             print("   ℹ️  Please install manually:")
-            print(f"      source {venv_path}/bin/activate")
+            print(f"      source {_ACTIVATE}")
             print("      uv sync")
             print("      uv pip install -r requirements.txt")
             sys.exit(1)
 
-    print(f"   ✅ Virtual environment created at: {venv_path}")
+    print(f"   ✅ Virtual environment created at: {_VENV}")
     print(f"   ✅ Dependencies installed successfully")
 
 
@@ -199,53 +293,18 @@ def create_activation_script():
     """Create activation script for easy startup."""
     print("🚀 Creating activation script...")
 
-    script_content = """#!/bin/bash
-# DevBlogger Activation Script
-# This script activates the virtual environment and runs DevBlogger
-
-# Get the directory where this script is located
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-VENV_PATH="$SCRIPT_DIR/devblogger-env"
-
-# Check if virtual environment exists
-if [ ! -d "$VENV_PATH" ]; then
-    echo "❌ Virtual environment not found at $VENV_PATH"
-    echo "Please run the installation script first:"
-    echo "  python install.py"
-    exit 1
-fi
-
-# Activate virtual environment
-echo "🔧 Activating virtual environment..."
-source "$VENV_PATH/bin/activate"
-
-# Check if activation worked
-if [ -z "$VIRTUAL_ENV" ]; then
-    echo "❌ Failed to activate virtual environment"
-    exit 1
-fi
-
-echo "✅ Virtual environment activated: $VIRTUAL_ENV"
-
-# Run DevBlogger
-echo "🚀 Starting DevBlogger..."
-python -m src.main "$@"
-"""
-
     script_path = Path("run_devblogger.sh")
-    with open(script_path, "w") as f:
-        f.write(script_content)
-
-    # Make executable
-    script_path.chmod(0o755)
+    write_file_bytes(script_path, _ACTIVATION_SCRIPT_BYTES, 0o755)
 
     print(f"   ✅ Created activation script: {script_path}")
     print("   ℹ️  Usage: ./run_devblogger.sh")
 
 
 def check_ollama_availability():
-    """Check if Ollama is available on the system."""
-    print("🤖 Checking Ollama availability...")
+    """Check if Ollama is available on the system, returning the report lines."""
+    import subprocess
+
+    lines = ["🤖 Checking Ollama availability..."]
 
     try:
         result = subprocess.run(
@@ -254,97 +313,71 @@ def check_ollama_availability():
             text=True,
             check=True
         )
-        print(f"   ✅ Ollama is installed: {result.stdout.strip()}")
+        lines.append(f"   ✅ Ollama is installed: {result.stdout.strip()}")
 
-        # Check what models are available
-        result = subprocess.run(
+        # Check what models are available, parsing the listing as it streams in
+        with subprocess.Popen(
             ["ollama", "list"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        if result.stdout.strip():
-            # Models are available
-            lines = result.stdout.strip().split('\n')
-            if len(lines) > 1:  # More than just the header
-                print(f"   ✅ Found {len(lines) - 1} model(s) available:")
-                for line in lines[1:]:  # Skip header
-                    model_name = line.split()[0]
-                    print(f"      • {model_name}")
-            else:
-                print("   ℹ️  Ollama is installed but no models are available")
-                print("   ℹ️  To use Ollama, install models manually:")
-                print("      ollama pull llama2")
-                print("      ollama pull codellama")
-                print("      ollama pull mistral")
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        ) as process:
+            models = [
+                line.split(maxsplit=1)[0]
+                for i, line in enumerate(process.stdout)
+                if i > 0 and line.strip()  # Skip header
+            ]
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+
+        if models:
+            lines.append(f"   ✅ Found {len(models)} model(s) available:")
+            for model_name in models:
+                lines.append(f"      • {model_name}")
         else:
-            print("   ℹ️  Ollama is installed but no models are available")
-            print("   ℹ️  To use Ollama, install models manually:")
-            print("      ollama pull llama2")
-            print("      ollama pull codellama")
-            print("      ollama pull mistral")
+            lines.append("   ℹ️  Ollama is installed but no models are available")
+            lines.append("   ℹ️  To use Ollama, install models manually:")
+            lines.append("      ollama pull llama2")
+            lines.append("      ollama pull codellama")
+            lines.append("      ollama pull mistral")
 
     except (subprocess.CalledProcessError, FileNotFoundError):
-        print("   ℹ️  Ollama is not installed")
-        print("   ℹ️  DevBlogger works perfectly without Ollama")
-        print("   ℹ️  You can use ChatGPT and Gemini for AI generation")
-        print("   ℹ️  To add Ollama support later:")
-        print("      1. Install from https://ollama.ai/")
-        print("      2. Pull models: ollama pull llama2")
+        lines.append("   ℹ️  Ollama is not installed")
+        lines.append("   ℹ️  DevBlogger works perfectly without Ollama")
+        lines.append("   ℹ️  You can use ChatGPT and Gemini for AI generation")
+        lines.append("   ℹ️  To add Ollama support later:")
+        lines.append("      1. Install from https://ollama.ai/")
+        lines.append("      2. Pull models: ollama pull llama2")
+
+    return lines
 
 
 def create_directories():
     """Create necessary directories."""
     print("📁 Creating application directories...")
 
-    directories = [
+    directories = (
         "Generated_Entries",
         "logs",
         "assets",
         "docs"
-    ]
+    )
 
     for directory in directories:
-        Path(directory).mkdir(exist_ok=True)
-        print(f"   ✅ Created {directory}/")
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
+
+    # Report all directories with a single write
+    sys.stdout.write("".join(f"   ✅ Created {directory}/\n" for directory in directories))
 
 
 def create_sample_config():
     """Create sample configuration file."""
     print("⚙️  Creating sample configuration...")
 
-    config_content = """# DevBlogger Configuration
-# This is a sample configuration file. Copy this to your config directory.
-
-[window]
-width = 1200
-height = 800
-
-[ai_providers.chatgpt]
-api_key = "your-openai-api-key-here"
-model = "gpt-4"
-max_tokens = 2000
-temperature = 0.7
-
-[ai_providers.gemini]
-api_key = "your-google-gemini-api-key-here"
-model = "gemini-pro"
-max_tokens = 2000
-temperature = 0.7
-
-[ai_providers.ollama]
-base_url = "http://localhost:11434"
-model = "llama2"
-max_tokens = 2000
-temperature = 0.7
-
-[blog]
-default_prompt = "Write a concise, informative, and interesting development blog entry based on the provided commit information. Focus on the most significant changes and improvements. Write in first person as if you are the developer describing your work. Keep the tone professional but engaging. Highlight technical achievements, challenges overcome, and the impact of the changes."
-"""
-
-    with open("devblogger_config.sample", "w") as f:
-        f.write(config_content)
+    write_file_bytes(Path("devblogger_config.sample"), _SAMPLE_CONFIG_BYTES, 0o644)
 
     print("   ✅ Created devblogger_config.sample")
 
@@ -355,7 +388,7 @@ def run_tests():
 
     try:
         result = run_command(
-            "python -m pytest tests/ -v",
+            [sys.executable, "-m", "pytest", "tests/", "-v"],
             "Running test suite",
             check=False
         )
@@ -372,6 +405,8 @@ def run_tests():
 
 def main():
     """Main installation function."""
+    import argparse
+
     print("🚀 DevBlogger Installation Script")
     print("=" * 40)
 
@@ -380,21 +415,24 @@ def main():
                        help="Skip running tests")
     args = parser.parse_args()
 
-    # Define virtual environment path
-    venv_path = Path("devblogger-env")
-
     try:
         # Pre-installation checks
         check_python_version()
-        check_uv_installation()
+
+        # Only the uv and Ollama probes run side by side; reporting and any
+        # UV install stay on this thread so output keeps its order.
+        # Always check Ollama availability (never install it).
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            uv_probe = executor.submit(probe_uv_version)
+            ollama_probe = executor.submit(check_ollama_availability)
+        check_uv_installation(uv_probe.result())
+        print("\n".join(ollama_probe.result()))
 
         # Installation steps
         create_virtual_environment()
         create_activation_script()
 
-        # Always check Ollama availability (never install it)
-        check_ollama_availability()
-
         create_directories()
         create_sample_config()
 
@@ -405,14 +443,13 @@ def main():
         print("\n" + "=" * 40)
         print("🎉 Installation completed successfully!")
         print("✅ Virtual environment created and populated!")
-        print(f"📍 Virtual environment location: {venv_path}")
+        print(f"📍 Virtual environment location: {_VENV}")
         print("\n🔧 To activate the virtual environment and run DevBlogger:")
         if os.name == 'nt':  # Windows
-            print("  devblogger-env\\Scripts\\activate")
-            print("  python -m src.main")
+            print(f"  {_ACTIVATE}")
         else:  # Unix/Linux/Mac
-            print("  source devblogger-env/bin/activate")
-            print("  python -m src.main")
+            print(f"  source {_ACTIVATE}")
+        print("  python -m src.main")
         print("\nOr use the activation script:")
         print("  ./run_devblogger.sh")
         print("\nFor more information, see README.md")
@@ -3,13 +3,81 @@
 DevBlogger - Base AI provider interface
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Iterator, Mapping, Optional, TypeVar
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 
 
-@dataclass
+_LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Shared event loop for synchronous callers, running on a daemon thread
+_BG_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_BG_LOOP_LOCK = threading.Lock()
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+def _get_bg_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting it on first use."""
+    global _BG_LOOP
+    if _BG_LOOP is None:
+        with _BG_LOOP_LOCK:
+            if _BG_LOOP is None:
+                loop = _new_event_loop()
+                if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+                    # Tasks that finish without awaiting skip a scheduler round-trip
+                    loop.set_task_factory(asyncio.eager_task_factory)
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="devblogger-ai-loop",
+                    daemon=True
+                )
+                thread.start()
+                _BG_LOOP = loop
+    return _BG_LOOP
+
+
+def in_running_loop() -> bool:
+    """Check whether the calling thread is currently running an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def run_sync(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the shared background loop and wait for its result."""
+    loop = _get_bg_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # Blocking here would deadlock the loop the coroutine needs
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the shared AI event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+@dataclass(slots=True, frozen=True)
 class AIResponse:
     """Response from AI provider."""
     text: str
@@ -17,21 +85,54 @@ class AIResponse:
     provider: str
     tokens_used: Optional[int] = None
     finish_reason: Optional[str] = None
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of generated responses."""
+
+    def __init__(self, maxsize: int = 512):
+        """Initialize an empty cache holding at most maxsize responses."""
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Any, AIResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[AIResponse]:
+        """Get a cached response, marking it as recently used."""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    def put(self, key: Any, response: AIResponse):
+        """Store a response, evicting the least recently used if full."""
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
 
 
 class AIProvider(ABC):
     """Base class for AI providers."""
 
+    # Requests generate_many runs at once unless told otherwise
+    default_concurrency = 8
+
     def __init__(self, name: str, model: str):
         """Initialize AI provider."""
         self.name = name
         self.model = model
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOG
+        # Last connection probe as (monotonic timestamp, model, result)
+        self._conn_cache: Optional[tuple[float, str, bool]] = None
+        self._response_cache = ResponseCache(maxsize=512)
 
     @abstractmethod
     def is_configured(self) -> bool:
@@ -43,6 +144,63 @@ class AIProvider(ABC):
         """Test connection to AI provider."""
         pass
 
+    def test_connection_cached(self, ttl: float = 30.0) -> bool:
+        """Test connection, reusing a recent result for the same model."""
+        cached = self._conn_cache
+        now = time.monotonic()
+        if cached is not None and cached[1] == self.model and now - cached[0] < ttl:
+            return cached[2]
+
+        result = self.test_connection()
+        self._conn_cache = (now, self.model, result)
+        return result
+
+    async def test_connection_async(self) -> bool:
+        """Test connection without blocking the event loop."""
+        return await asyncio.to_thread(self.test_connection)
+
+    async def refresh_connection_status(self) -> bool:
+        """Test connection asynchronously and store the result for test_connection_cached()."""
+        model = self.model
+        result = await self.test_connection_async()
+        self._conn_cache = (time.monotonic(), model, result)
+        return result
+
+    def invalidate_connection_cache(self):
+        """Forget the cached connection result (e.g. after a config change)."""
+        self._conn_cache = None
+
+    def _response_cache_key(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        use_cache: Optional[bool],
+        kwargs: Dict[str, Any]
+    ) -> Optional[bytes]:
+        """Get the response cache key for a request, or None if it shouldn't be cached."""
+        # By default only deterministic requests are cached, so regenerating
+        # with a non-zero temperature still produces fresh text
+        if use_cache is None:
+            use_cache = temperature == 0
+        if not use_cache:
+            return None
+
+        params = (self.model, max_tokens, temperature, tuple(sorted(kwargs.items())))
+        try:
+            hash(params)
+        except TypeError:
+            return None
+
+        # A 16-byte digest keeps long prompts out of the cache's keys
+        digest = hashlib.blake2b(repr(params).encode("utf-8"), digest_size=16, person=b"devblog")
+        digest.update(prompt.encode("utf-8"))
+        return digest.digest()
+
+    async def aclose(self):
+        """Release network resources (sessions, connection pools) held by the provider."""
+        pass
+
     @abstractmethod
     async def generate_text(
         self,
@@ -54,6 +212,34 @@ class AIProvider(ABC):
         """Generate text using AI model."""
         pass
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Generate text as it arrives; providers without streaming yield it all at once."""
+        response = await self.generate_text(prompt, max_tokens, temperature, **kwargs)
+        yield response.text
+
+    async def generate_many(
+        self,
+        prompts: List[str],
+        concurrency: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> List[AIResponse]:
+        """Generate text for several prompts concurrently, returning responses in order."""
+        semaphore = asyncio.Semaphore(concurrency or self.default_concurrency)
+
+        async def generate_one(prompt: str) -> AIResponse:
+            async with semaphore:
+                return await self.generate_text(prompt, max_tokens, temperature, **kwargs)
+
+        return list(await asyncio.gather(*(generate_one(prompt) for prompt in prompts)))
+
     def generate_sync(
         self,
         prompt: str,
@@ -62,31 +248,8 @@ class AIProvider(ABC):
         **kwargs
     ) -> str:
         """Generate text synchronously (fallback for threading issues)."""
-        import asyncio
-        try:
-            # Try to get existing event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If loop is running, we can't use run_until_complete
-                # This is a fallback - subclasses should implement proper sync methods
-                raise NotImplementedError("Synchronous generation not implemented for this provider")
-            else:
-                # Loop exists but not running
-                response = loop.run_until_complete(
-                    self.generate_text(prompt, max_tokens, temperature, **kwargs)
-                )
-                return response.text
-        except RuntimeError:
-            # No event loop, create one
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                response = loop.run_until_complete(
-                    self.generate_text(prompt, max_tokens, temperature, **kwargs)
-                )
-                return response.text
-            finally:
-                loop.close()
+        response = run_sync(self.generate_text(prompt, max_tokens, temperature, **kwargs))
+        return response.text
 
     @abstractmethod
     def get_available_models(self) -> List[str]:
@@ -98,6 +261,25 @@ class AIProvider(ABC):
         """Get information about a specific model."""
         pass
 
+    def default_config(self) -> Dict[str, Any]:
+        """Get the provider's default configuration."""
+        return {}
+
+    def apply_config(self, config: Dict[str, Any]) -> None:
+        """Apply a configuration dict to matching attributes, filling gaps from default_config()."""
+        for key, value in {**self.default_config(), **config}.items():
+            if hasattr(self, key):
+                setattr(self, key, value)
+        self.invalidate_connection_cache()
+
+    def max_context_tokens(self) -> int:
+        """Get the context window, in tokens, shared by the prompt and the completion."""
+        return self.get_model_info(self.model).get("context_length", 4096)
+
+    def get_cached_models(self) -> List[str]:
+        """Get models from a previous listing without querying the provider."""
+        return []
+
     def validate_config(self) -> List[str]:
         """Validate provider configuration and return list of issues."""
         issues = []
@@ -124,35 +306,50 @@ class AIProviderManager:
     def __init__(self):
         """Initialize AI provider manager."""
         self.providers: Dict[str, AIProvider] = {}
-        self.active_provider: Optional[str] = None
-        self.logger = logging.getLogger(__name__)
+        self._providers_view = MappingProxyType(self.providers)
+        self._active: Optional[AIProvider] = None
+        self.logger = _LOG
+
+    @property
+    def active_provider(self) -> Optional[str]:
+        """Name of the active provider."""
+        active = self._active
+        return active.name if active is not None else None
+
+    @active_provider.setter
+    def active_provider(self, name: Optional[str]):
+        self._active = self.providers.get(name) if name else None
 
     def register_provider(self, provider: AIProvider):
         """Register an AI provider."""
         self.providers[provider.name] = provider
         self.logger.info(f"Registered AI provider: {provider.name}")
 
+    def reconfigure(self, name: str):
+        """Refresh cached state after a provider's configuration changed."""
+        provider = self.providers.get(name)
+        if provider is not None:
+            provider.invalidate_connection_cache()
+
     def get_provider(self, name: str) -> Optional[AIProvider]:
         """Get provider by name."""
         return self.providers.get(name)
 
     def set_active_provider(self, name: str):
         """Set active provider."""
-        if name in self.providers:
-            self.active_provider = name
-            self.logger.info(f"Set active provider: {name}")
-        else:
+        provider = self.providers.get(name)
+        if provider is None:
             raise ValueError(f"Provider {name} not found")
+        self._active = provider
+        self.logger.info(f"Set active provider: {name}")
 
     def get_active_provider(self) -> Optional[AIProvider]:
         """Get active provider."""
-        if self.active_provider:
-            return self.providers.get(self.active_provider)
-        return None
+        return self._active
 
-    def get_all_providers(self) -> Dict[str, AIProvider]:
-        """Get all registered providers."""
-        return self.providers.copy()
+    def get_all_providers(self) -> Mapping[str, AIProvider]:
+        """Get a read-only view of all registered providers."""
+        return self._providers_view
 
     def get_provider_status(self, name: str) -> Dict[str, Any]:
         """Get status of a specific provider."""
@@ -168,12 +365,32 @@ class AIProviderManager:
             for name, provider in self.providers.items()
         }
 
+    def iter_statuses(self) -> Iterator[tuple[str, Dict[str, Any]]]:
+        """Yield (name, status) pairs one provider at a time."""
+        for name, provider in self.providers.items():
+            yield name, provider.get_status()
+
+    def iter_validations(self) -> Iterator[tuple[str, List[str]]]:
+        """Yield (name, issues) pairs one provider at a time."""
+        for name, provider in self.providers.items():
+            yield name, provider.validate_config()
+
     def validate_all_providers(self) -> Dict[str, List[str]]:
         """Validate all providers and return issues."""
-        return {
-            name: provider.validate_config()
-            for name, provider in self.providers.items()
-        }
+        return dict(self.iter_validations())
+
+    def close(self):
+        """Close every provider's network resources."""
+        async def close_all():
+            results = await asyncio.gather(
+                *(provider.aclose() for provider in self.providers.values()),
+                return_exceptions=True
+            )
+            for name, result in zip(self.providers, results):
+                if isinstance(result, Exception):
+                    self.logger.warning("Error closing %s: %s", name, result)
+
+        run_sync(close_all(), timeout=5)
 
     async def generate_with_active(
         self,
@@ -183,8 +400,8 @@ class AIProviderManager:
         **kwargs
     ) -> AIResponse:
         """Generate text using active provider."""
-        provider = self.get_active_provider()
-        if not provider:
+        provider = self._active
+        if provider is None:
             raise ValueError("No active AI provider set")
 
         if not provider.is_configured():
@@ -201,7 +418,17 @@ class AIProviderManager:
 
     def get_working_providers(self) -> List[str]:
         """Get list of providers that are both configured and working."""
-        return [
-            name for name, provider in self.providers.items()
-            if provider.is_configured() and provider.test_connection()
-        ]
+        return self._probe_providers(self.get_configured_providers())
+
+    def _probe_providers(self, names: List[str]) -> List[str]:
+        """Return the given providers that pass a (cached) connection test, in order."""
+        if not names:
+            return []
+
+        # Probe the providers concurrently
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            results = executor.map(
+                lambda name: (name, self.providers[name].test_connection_cached()),
+                names
+            )
+            return [name for name, working in results if working]
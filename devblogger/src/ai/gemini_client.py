@@ -3,24 +3,87 @@
 DevBlogger - Google Gemini provider
 """
 
-import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Optional
 import os
 
-try:
-    import google.generativeai as genai
-    from google.generativeai.types import RequestOptions
-    GENAI_AVAILABLE = True
-except ImportError:
-    GENAI_AVAILABLE = False
-    genai = None
-    RequestOptions = None
-
-from .base import AIProvider, AIResponse
+from .base import AIProvider, AIResponse, in_running_loop
 from ..config.settings import Settings
 
 
+# Google API keys are 39 characters: 'AIza' followed by 35 URL-safe characters
+_GOOGLE_KEY_RE = re.compile(r'AIza[0-9A-Za-z_\-]{35}')
+
+# google.generativeai is heavy (grpc, protobuf), so it is imported on first use.
+# GENAI_AVAILABLE is None until the import has been attempted.
+genai = None
+GENAI_AVAILABLE: Optional[bool] = None
+
+
+def _load_genai():
+    """Import google.generativeai on first use; return the module or None."""
+    global genai, GENAI_AVAILABLE
+    if GENAI_AVAILABLE is None:
+        try:
+            import google.generativeai as _genai
+        except ImportError:
+            GENAI_AVAILABLE = False
+        else:
+            genai = _genai
+            GENAI_AVAILABLE = True
+    return genai if GENAI_AVAILABLE else None
+
+
+# API key genai is currently configured with; configure() drops every pooled
+# client (and its gRPC channel), so it's only called when the key changes
+_CONFIGURED_KEY: Optional[str] = None
+
+
+def _configure_genai(api_key: str):
+    """Point the shared genai clients at api_key, keeping them if it's unchanged."""
+    global _CONFIGURED_KEY
+    if _CONFIGURED_KEY != api_key:
+        genai.configure(api_key=api_key)
+        _CONFIGURED_KEY = api_key
+
+
+@lru_cache(maxsize=8)
+def _list_gemini_models(api_key: str) -> tuple[str, ...]:
+    """List Gemini models for an API key, shared by every provider instance until cleared."""
+    _configure_genai(api_key)
+    return tuple(
+        model.name.split("/")[-1]
+        for model in genai.list_models()
+        if "gemini" in model.name
+    )
+
+
+@lru_cache(maxsize=64)
+def _make_gen_config(max_tokens: int, temperature: float, extra_items: tuple = ()):
+    """Build (and reuse) a GenerationConfig for the given parameters."""
+    return genai.types.GenerationConfig(
+        max_output_tokens=max_tokens,
+        temperature=temperature,
+        **dict(extra_items)
+    )
+
+
+def _generation_config(max_tokens: int, temperature: float, **kwargs):
+    """Get a GenerationConfig, cached when all parameters are hashable."""
+    extra_items = tuple(sorted(kwargs.items()))
+    try:
+        return _make_gen_config(max_tokens, temperature, extra_items)
+    except TypeError:
+        # Unhashable option values (e.g. lists) can't be cache keys
+        return genai.types.GenerationConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        )
+
+
 class GeminiProvider(AIProvider):
     """Google Gemini provider."""
 
@@ -31,11 +94,15 @@ class GeminiProvider(AIProvider):
         self.settings = settings
         self.api_key = ""
         self.model_instance = None
+        # (api_key, model) the current model_instance was created with
+        self._configured_key: Optional[tuple[str, str]] = None
+        # (api_key, models) from this provider's last successful model listing
+        self._listed_models: Optional[tuple[str, tuple[str, ...]]] = None
 
         # Load configuration
         self._load_config()
 
-        if GENAI_AVAILABLE and self.api_key:
+        if self.api_key:
             self._initialize_client()
 
     def _load_config(self):
@@ -47,21 +114,31 @@ class GeminiProvider(AIProvider):
             self.max_tokens = config.get("max_tokens", 2000)
             self.temperature = config.get("temperature", 0.7)
         except Exception as e:
-            self.logger.error(f"Error loading Gemini config: {e}")
+            self.logger.error("Error loading Gemini config: %s", e)
 
     def _initialize_client(self):
         """Initialize Google Generative AI client."""
+        genai = _load_genai()
+        if genai is None:
+            self.logger.warning("google-generativeai is not installed; Gemini is unavailable")
+            self.model_instance = None
+            self._configured_key = None
+            return
+
         try:
-            genai.configure(api_key=self.api_key)
+            _configure_genai(self.api_key)
             self.model_instance = genai.GenerativeModel(self.model)
-            self.logger.info(f"Initialized Gemini client with model: {self.model}")
+            self._configured_key = (self.api_key, self.model)
+            self.logger.info("Initialized Gemini client with model: %s", self.model)
         except Exception as e:
-            self.logger.error(f"Error initializing Gemini client: {e}")
+            self.logger.error("Error initializing Gemini client: %s", e)
             self.model_instance = None
+            self._configured_key = None
 
     def is_configured(self) -> bool:
         """Check if Gemini is properly configured."""
-        return bool(self.api_key and GENAI_AVAILABLE and self.model_instance)
+        # model_instance is only set once google.generativeai has been imported
+        return bool(self.api_key and self.model_instance)
 
     def test_connection(self) -> bool:
         """Test connection to Gemini API."""
@@ -70,24 +147,45 @@ class GeminiProvider(AIProvider):
 
         try:
             # Simple synchronous test - just check if we can create a generation config
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=10,
-                temperature=0.1
-            )
+            generation_config = _generation_config(10, 0.1)
             return True  # If we can create config and model is initialized, assume working
         except Exception as e:
-            self.logger.error(f"Gemini connection test failed: {e}")
+            self.logger.error("Gemini connection test failed: %s", e)
             return False
 
+    def _build_response(self, response) -> AIResponse:
+        """Convert a Gemini API response into an AIResponse."""
+        # Extract response data
+        text = response.text.strip()
+
+        # Get token usage if available
+        usage = getattr(response, 'usage_metadata', None)
+        prompt_tokens = getattr(usage, 'prompt_token_count', None) if usage else None
+        completion_tokens = getattr(usage, 'candidates_token_count', None) if usage else None
+        tokens_used = None
+        if prompt_tokens is not None and completion_tokens is not None:
+            tokens_used = prompt_tokens + completion_tokens
+
+        return AIResponse(
+            text=text,
+            model=self.model,
+            provider=self.name,
+            tokens_used=tokens_used,
+            finish_reason=getattr(response, 'finish_reason', None),
+            metadata={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "model": self.model,
+                "id": getattr(response, 'id', None)
+            }
+        )
+
     async def _test_generation(self) -> bool:
         """Test Gemini API with a simple generation."""
         try:
             response = await self.model_instance.generate_content_async(
                 "Hello",
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=10,
-                    temperature=0.1
-                )
+                generation_config=_generation_config(10, 0.1)
             )
             return bool(response.text)
         except Exception:
@@ -98,6 +196,7 @@ class GeminiProvider(AIProvider):
         prompt: str,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        use_cache: Optional[bool] = None,
         **kwargs
     ) -> AIResponse:
         """Generate text using Google Gemini."""
@@ -108,13 +207,15 @@ class GeminiProvider(AIProvider):
         max_tokens = max_tokens or self.max_tokens
         temperature = temperature if temperature is not None else self.temperature
 
+        cache_key = self._response_cache_key(prompt, max_tokens, temperature, use_cache, kwargs)
+        if cache_key is not None:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             # Configure generation
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs
-            )
+            generation_config = _generation_config(max_tokens, temperature, **kwargs)
 
             # Generate content
             response = await self.model_instance.generate_content_async(
@@ -122,53 +223,80 @@ class GeminiProvider(AIProvider):
                 generation_config=generation_config
             )
 
-            # Extract response data
-            text = response.text.strip()
-
-            # Get token usage if available
-            tokens_used = None
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                tokens_used = (response.usage_metadata.prompt_token_count +
-                             response.usage_metadata.candidates_token_count)
-
-            return AIResponse(
-                text=text,
-                model=self.model,
-                provider=self.name,
-                tokens_used=tokens_used,
-                finish_reason=getattr(response, 'finish_reason', None),
-                metadata={
-                    "prompt_tokens": getattr(response.usage_metadata, 'prompt_token_count', None) if hasattr(response, 'usage_metadata') else None,
-                    "completion_tokens": getattr(response.usage_metadata, 'candidates_token_count', None) if hasattr(response, 'usage_metadata') else None,
-                    "model": self.model,
-                    "id": getattr(response, 'id', None)
-                }
+            result = self._build_response(response)
+            if cache_key is not None:
+                self._response_cache.put(cache_key, result)
+            return result
+
+        except Exception as e:
+            self.logger.error("Gemini generation error: %s", e)
+            raise ValueError(f"Gemini API error: {str(e)}")
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Generate text using Google Gemini, yielding chunks as they arrive."""
+        if not self.model_instance:
+            raise ValueError("Gemini model not initialized")
+
+        max_tokens = max_tokens or self.max_tokens
+        temperature = temperature if temperature is not None else self.temperature
+
+        try:
+            generation_config = _generation_config(max_tokens, temperature, **kwargs)
+            response = await self.model_instance.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=True
             )
+            async for chunk in response:
+                text = chunk.text
+                if text:
+                    yield text
 
         except Exception as e:
-            self.logger.error(f"Gemini generation error: {e}")
+            self.logger.error("Gemini streaming error: %s", e)
             raise ValueError(f"Gemini API error: {str(e)}")
 
     def get_available_models(self) -> List[str]:
         """Get list of available Gemini models."""
-        if not GENAI_AVAILABLE:
+        genai = _load_genai()
+        if genai is None:
             return []
 
+        cached = self.get_cached_models()
+        if cached:
+            return cached
+
+        if in_running_loop():
+            # Don't block a running event loop on the network
+            return ["gemini-pro", "gemini-pro-vision"]  # Common models
+
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                return ["gemini-pro", "gemini-pro-vision"]  # Common models
-            else:
-                # Get available models
-                models = []
-                for model in genai.list_models():
-                    if "gemini" in model.name:
-                        models.append(model.name.split("/")[-1])
-                return models
+            models = _list_gemini_models(self.api_key)
+            self._listed_models = (self.api_key, models)
+            return list(models)
         except Exception as e:
-            self.logger.error(f"Error getting Gemini models: {e}")
+            self.logger.error("Error getting Gemini models: %s", e)
             return ["gemini-pro", "gemini-pro-vision"]  # Fallback to known models
 
+    def get_cached_models(self) -> List[str]:
+        """Get the model list from the last listing for the current API key."""
+        listed = self._listed_models
+        if listed is None or listed[0] != self.api_key:
+            return []
+        return list(listed[1])
+
+    def invalidate_connection_cache(self):
+        """Forget the cached connection result and model catalogs (e.g. after a config change)."""
+        super().invalidate_connection_cache()
+        self._listed_models = None
+        _list_gemini_models.cache_clear()
+
     def get_model_info(self, model: str) -> Dict[str, Any]:
         """Get information about a specific Gemini model."""
         model_configs = {
@@ -199,8 +327,24 @@ class GeminiProvider(AIProvider):
             "description": f"Google {model} model"
         })
 
+    def default_config(self) -> Dict[str, Any]:
+        """Get default Gemini configuration."""
+        return {"api_key": "", "model": "gemini-pro"}
+
+    def apply_config(self, config: Dict[str, Any]):
+        """Apply a Gemini configuration dict."""
+        defaults = self.default_config()
+        self.update_config(
+            config.get("api_key", defaults["api_key"]),
+            config.get("model", defaults["model"])
+        )
+
     def update_config(self, api_key: str, model: str = "gemini-pro"):
         """Update Gemini configuration."""
+        # Only rebuild the client (and its HTTP state) when something changed
+        needs_reinit = (
+            self.model_instance is None or self._configured_key != (api_key, model)
+        )
         self.api_key = api_key
         self.model = model
 
@@ -213,19 +357,15 @@ class GeminiProvider(AIProvider):
         }
         self.settings.set_ai_provider_config("gemini", config)
 
-        # Reinitialize client
-        if GENAI_AVAILABLE:
+        if needs_reinit:
+            self.invalidate_connection_cache()
             self._initialize_client()
 
-        self.logger.info(f"Updated Gemini config: model={model}")
+        self.logger.info("Updated Gemini config: model=%s", model)
 
     def validate_api_key(self, api_key: str) -> bool:
         """Validate Google API key format."""
-        if not api_key:
-            return False
-
-        # Google API keys are typically 39 characters long and start with 'AIza'
-        return api_key.startswith("AIza") and len(api_key) == 39
+        return bool(api_key) and _GOOGLE_KEY_RE.fullmatch(api_key) is not None
 
     def get_usage_info(self) -> Dict[str, Any]:
         """Get Gemini usage information."""
@@ -236,67 +376,3 @@ class GeminiProvider(AIProvider):
             "temperature": self.temperature,
             "api_key_valid": self.validate_api_key(self.api_key)
         }
-
-
-class GeminiProviderSync(GeminiProvider):
-    """Synchronous version of Gemini provider for compatibility."""
-
-    def __init__(self, settings: Settings):
-        """Initialize synchronous Gemini provider."""
-        super().__init__(settings)
-
-    async def generate_text(
-        self,
-        prompt: str,
-        max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None,
-        **kwargs
-    ) -> AIResponse:
-        """Generate text using Google Gemini (sync version)."""
-        if not self.model_instance:
-            raise ValueError("Gemini model not initialized")
-
-        # Use provided parameters or defaults
-        max_tokens = max_tokens or self.max_tokens
-        temperature = temperature if temperature is not None else self.temperature
-
-        try:
-            # Configure generation
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs
-            )
-
-            # Generate content using sync method
-            response = self.model_instance.generate_content(
-                prompt,
-                generation_config=generation_config
-            )
-
-            # Extract response data
-            text = response.text.strip()
-
-            # Get token usage if available
-            tokens_used = None
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                tokens_used = (response.usage_metadata.prompt_token_count +
-                             response.usage_metadata.candidates_token_count)
-
-            return AIResponse(
-                text=text,
-                model=self.model,
-                provider=self.name,
-                tokens_used=tokens_used,
-                finish_reason=getattr(response, 'finish_reason', None),
-                metadata={
-                    "prompt_tokens": getattr(response.usage_metadata, 'prompt_token_count', None) if hasattr(response, 'usage_metadata') else None,
-                    "completion_tokens": getattr(response.usage_metadata, 'candidates_token_count', None) if hasattr(response, 'usage_metadata') else None,
-                    "model": self.model,
-                    "id": getattr(response, 'id', None)
-                }
-            )
-
-        except Exception as e:
-            self.logger.error(f"Gemini generation error: {e}")
-            raise ValueError(f"Gemini API error: {str(e)}")
@@ -3,16 +3,20 @@
 DevBlogger - AI Provider Manager
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, FrozenSet, Optional, List, Tuple
 
-from .base import AIProviderManager, AIProvider
-from .openai_client import OpenAIProviderSync
-from .gemini_client import GeminiProviderSync
-from .ollama_client import OllamaProviderSync
+from .base import AIProviderManager, AIProvider, run_sync
+from .openai_client import OpenAIProvider
+from .gemini_client import GeminiProvider
+from .ollama_client import OllamaProvider
 from ..config.settings import Settings
 
 
+_LOG = logging.getLogger(__name__)
+
+
 class DevBloggerAIProviderManager(AIProviderManager):
     """AI Provider Manager for DevBlogger application."""
 
@@ -20,7 +24,7 @@ class DevBloggerAIProviderManager(AIProviderManager):
         """Initialize AI provider manager."""
         super().__init__()
         self.settings = settings
-        self.logger = logging.getLogger(__name__)
+        self.logger = _LOG
 
         # Register all available providers
         self._register_providers()
@@ -29,22 +33,22 @@ class DevBloggerAIProviderManager(AIProviderManager):
         """Register all available AI providers."""
         try:
             # Register OpenAI ChatGPT provider
-            chatgpt_provider = OpenAIProviderSync(self.settings)
+            chatgpt_provider = OpenAIProvider(self.settings)
             self.register_provider(chatgpt_provider)
 
             # Register Google Gemini provider
-            gemini_provider = GeminiProviderSync(self.settings)
+            gemini_provider = GeminiProvider(self.settings)
             self.register_provider(gemini_provider)
 
             # Register Ollama provider
-            ollama_provider = OllamaProviderSync(self.settings)
+            ollama_provider = OllamaProvider(self.settings)
             self.register_provider(ollama_provider)
 
             # Set default active provider
             self._set_default_active_provider()
 
         except Exception as e:
-            self.logger.error(f"Error registering providers: {e}")
+            self.logger.error("Error registering providers: %s", e)
 
     def _set_default_active_provider(self):
         """Set the default active provider based on configuration."""
@@ -53,33 +57,39 @@ class DevBloggerAIProviderManager(AIProviderManager):
 
             if default_provider in self.providers:
                 self.active_provider = default_provider
-                self.logger.info(f"Set default active provider: {default_provider}")
+                self.logger.info("Set default active provider: %s", default_provider)
             else:
                 # Find first configured provider
                 configured_providers = self.get_configured_providers()
                 if configured_providers:
                     self.active_provider = configured_providers[0]
-                    self.logger.info(f"Set first configured provider as active: {self.active_provider}")
+                    self.logger.info("Set first configured provider as active: %s", self.active_provider)
                 else:
                     self.logger.warning("No configured AI providers found")
 
         except Exception as e:
-            self.logger.error(f"Error setting default provider: {e}")
+            self.logger.error("Error setting default provider: %s", e)
 
     def get_provider_status_summary(self) -> Dict[str, Any]:
         """Get a summary of all provider statuses."""
         all_statuses = self.get_all_statuses()
 
+        configured, working = self._snapshot()
         summary = {
             "total_providers": len(self.providers),
-            "configured_providers": len(self.get_configured_providers()),
-            "working_providers": len(self.get_working_providers()),
+            "configured_providers": len(configured),
+            "working_providers": len(working),
             "active_provider": self.active_provider,
             "providers": all_statuses
         }
 
         return summary
 
+    def _snapshot(self) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """Check every provider once and return (configured, working) names."""
+        configured = self.get_configured_providers()
+        return frozenset(configured), frozenset(self._probe_providers(configured))
+
     def validate_all_configurations(self) -> Dict[str, List[str]]:
         """Validate all provider configurations and return issues."""
         issues = {}
@@ -93,22 +103,18 @@ class DevBloggerAIProviderManager(AIProviderManager):
 
     def get_recommended_provider(self) -> Optional[str]:
         """Get the recommended provider based on configuration and availability."""
-        working_providers = self.get_working_providers()
+        configured, working = self._snapshot()
 
-        if working_providers:
+        if working:
             # Prefer the currently active provider if it's working
-            if self.active_provider and self.active_provider in working_providers:
+            if self.active_provider and self.active_provider in working:
                 return self.active_provider
 
-            # Otherwise return the first working provider
-            return working_providers[0]
+            # Otherwise return the first working provider in registration order
+            return next(name for name in self.providers if name in working)
 
         # If no providers are working, return the first configured one
-        configured_providers = self.get_configured_providers()
-        if configured_providers:
-            return configured_providers[0]
-
-        return None
+        return next((name for name in self.providers if name in configured), None)
 
     def switch_to_best_provider(self) -> bool:
         """Switch to the best available provider."""
@@ -117,27 +123,47 @@ class DevBloggerAIProviderManager(AIProviderManager):
         if recommended and recommended != self.active_provider:
             try:
                 self.set_active_provider(recommended)
-                self.logger.info(f"Switched to best provider: {recommended}")
+                self.logger.info("Switched to best provider: %s", recommended)
                 return True
             except Exception as e:
-                self.logger.error(f"Error switching to best provider: {e}")
+                self.logger.error("Error switching to best provider: %s", e)
                 return False
 
         return False
 
-    def get_provider_capabilities(self, provider_name: str) -> Dict[str, Any]:
-        """Get detailed capabilities of a specific provider."""
+    def get_provider_capabilities(
+        self,
+        provider_name: str,
+        deep: bool = True,
+        cached_availability: Optional[Dict[str, bool]] = None
+    ) -> Dict[str, Any]:
+        """Get detailed capabilities of a specific provider.
+
+        With deep=False no network calls are made: availability comes from
+        cached_availability and models from the provider's last listing.
+        """
         provider = self.get_provider(provider_name)
         if not provider:
             return {"error": "Provider not found"}
 
         try:
+            if not deep:
+                available = (cached_availability or {}).get(provider_name, False)
+                models = provider.get_cached_models()
+            else:
+                # Reuse connection results the caller already probed, if given
+                if cached_availability is not None and provider_name in cached_availability:
+                    available = cached_availability[provider_name]
+                else:
+                    available = provider.test_connection_cached()
+                models = provider.get_available_models()
+
             return {
                 "name": provider.name,
                 "model": provider.model,
                 "configured": provider.is_configured(),
-                "available": provider.test_connection(),
-                "available_models": provider.get_available_models(),
+                "available": available,
+                "available_models": models,
                 "model_info": provider.get_model_info(provider.model),
                 "usage_info": self._get_provider_usage_info(provider),
                 "status": provider.get_status()
@@ -159,63 +185,59 @@ class DevBloggerAIProviderManager(AIProviderManager):
         """Update configuration for a specific provider."""
         provider = self.get_provider(provider_name)
         if not provider:
-            self.logger.error(f"Provider {provider_name} not found")
+            self.logger.error("Provider %s not found", provider_name)
             return False
 
         try:
-            if provider_name == "chatgpt":
-                api_key = config.get("api_key", "")
-                model = config.get("model", "gpt-4")
-                provider.update_config(api_key, model)
-
-            elif provider_name == "gemini":
-                api_key = config.get("api_key", "")
-                model = config.get("model", "gemini-pro")
-                provider.update_config(api_key, model)
-
-            elif provider_name == "ollama":
-                base_url = config.get("base_url", "http://localhost:11434")
-                model = config.get("model", "llama2")
-                provider.update_config(base_url, model)
-
-            self.logger.info(f"Updated configuration for {provider_name}")
+            provider.apply_config(config)
+            self.reconfigure(provider_name)
+            self.logger.info("Updated configuration for %s", provider_name)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error updating {provider_name} config: {e}")
+            self.logger.error("Error updating %s config: %s", provider_name, e)
             return False
 
     def test_all_providers(self) -> Dict[str, bool]:
         """Test all providers and return their status."""
-        results = {}
+        return run_sync(self.test_all_providers_async())
 
-        for name, provider in self.providers.items():
-            try:
-                results[name] = provider.test_connection()
-            except Exception as e:
-                self.logger.error(f"Error testing {name}: {e}")
+    async def test_all_providers_async(self) -> Dict[str, bool]:
+        """Test all providers concurrently and return their status."""
+        names = list(self.providers)
+        # Always probe, refreshing the cached result for other callers
+        outcomes = await asyncio.gather(
+            *(self.providers[name].refresh_connection_status() for name in names),
+            return_exceptions=True
+        )
+
+        results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, Exception):
+                self.logger.error("Error testing %s: %s", name, outcome)
                 results[name] = False
+            else:
+                results[name] = outcome
 
         return results
 
     def get_generation_stats(self) -> Dict[str, Any]:
         """Get generation statistics for all providers."""
-        stats = {
+        configured, working = self._snapshot()
+        return {
             "total_providers": len(self.providers),
             "active_provider": self.active_provider,
-            "provider_stats": {}
-        }
-
-        for name, provider in self.providers.items():
-            stats["provider_stats"][name] = {
-                "configured": provider.is_configured(),
-                "available": provider.test_connection(),
-                "model": provider.model,
-                "max_tokens": getattr(provider, 'max_tokens', None),
-                "temperature": getattr(provider, 'temperature', None)
+            "provider_stats": {
+                name: {
+                    "configured": name in configured,
+                    "available": name in working,
+                    "model": provider.model,
+                    "max_tokens": getattr(provider, 'max_tokens', None),
+                    "temperature": getattr(provider, 'temperature', None)
+                }
+                for name, provider in self.providers.items()
             }
-
-        return stats
+        }
 
     def reset_provider_config(self, provider_name: str) -> bool:
         """Reset provider configuration to defaults."""
@@ -224,35 +246,40 @@ class DevBloggerAIProviderManager(AIProviderManager):
             return False
 
         try:
-            # Reset to default configuration
-            if provider_name == "chatgpt":
-                provider.update_config("", "gpt-4")
-            elif provider_name == "gemini":
-                provider.update_config("", "gemini-pro")
-            elif provider_name == "ollama":
-                provider.update_config("http://localhost:11434", "llama2")
-
-            self.logger.info(f"Reset configuration for {provider_name}")
+            provider.apply_config(provider.default_config())
+            self.reconfigure(provider_name)
+            self.logger.info("Reset configuration for %s", provider_name)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error resetting {provider_name} config: {e}")
+            self.logger.error("Error resetting %s config: %s", provider_name, e)
             return False
 
     def get_provider_diagnostics(self) -> Dict[str, Any]:
         """Get comprehensive diagnostics for all providers."""
+        return run_sync(self.get_provider_diagnostics_async())
+
+    async def get_provider_diagnostics_async(self) -> Dict[str, Any]:
+        """Get comprehensive diagnostics, querying providers concurrently."""
+        # Test first so the summary below is served from the fresh probe results
+        test_results = await self.test_all_providers_async()
+
         diagnostics = {
             "timestamp": None,  # Will be set by caller
-            "summary": self.get_provider_status_summary(),
+            "summary": await asyncio.to_thread(self.get_provider_status_summary),
             "configurations": self.validate_all_configurations(),
-            "test_results": self.test_all_providers(),
+            "test_results": test_results,
             "capabilities": {},
             "issues": []
         }
 
-        # Get capabilities for each provider
-        for name in self.providers.keys():
-            diagnostics["capabilities"][name] = self.get_provider_capabilities(name)
+        # Shallow capabilities reuse the connection tests above instead of re-probing
+        diagnostics["capabilities"] = {
+            name: self.get_provider_capabilities(
+                name, deep=False, cached_availability=test_results
+            )
+            for name in self.providers
+        }
 
         # Collect all issues
         for name, issues in diagnostics["configurations"].items():
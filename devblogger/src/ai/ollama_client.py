@@ -6,24 +6,87 @@ DevBlogger - Ollama local AI provider
 import asyncio
 import json
 import logging
-from typing import List, Dict, Any, Optional
-import aiohttp
-import requests
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, Optional
+from urllib.parse import urlparse
 
-from .base import AIProvider, AIResponse
+from .base import AIProvider, AIResponse, run_sync
 from ..config.settings import Settings
 
+if TYPE_CHECKING:
+    # aiohttp is imported on first network use to keep startup fast
+    import aiohttp
+
+try:
+    # Optional faster parser for the NDJSON streams; its JSONDecodeError
+    # subclasses json.JSONDecodeError, so callers catch either
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=64)
+def _validate_base_url(base_url: str) -> bool:
+    """Check that base_url has a scheme and host (memoized; called on every refresh)."""
+    if not base_url:
+        return False
+
+    try:
+        # Basic URL validation
+        parsed = urlparse(base_url)
+        return bool(parsed.scheme and parsed.netloc)
+    except Exception:
+        return False
+
+
+def _client_timeout(total: float) -> "aiohttp.ClientTimeout":
+    """Build an aiohttp timeout (aiohttp is imported on first network use)."""
+    import aiohttp
+    return aiohttp.ClientTimeout(total=total)
+
+
+# How long an /api/tags listing is reused, in seconds
+_MODELS_TTL = 5.0
+
+# Model used by a fresh install and after a config reset
+_DEFAULT_MODEL = "llama3.1:latest"
+
+
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text as its whitespace-separated word count."""
+    return len(text.split())
+
 
 class OllamaProvider(AIProvider):
     """Ollama local AI provider."""
 
+    # A local server generates with one model at a time
+    default_concurrency = 1
+
     def __init__(self, settings: Settings):
         """Initialize Ollama provider."""
-        super().__init__("ollama", "llama3.1:latest")
+        super().__init__("ollama", _DEFAULT_MODEL)
 
         self.settings = settings
         self.base_url = "http://localhost:11434"
         self.client = None
+        # Persistent HTTP session, bound to the event loop it was created on
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Static part of /api/generate requests as ((model, max_tokens, temperature), request)
+        self._request_template: Optional[tuple[tuple, Dict[str, Any]]] = None
+        # Recent /api/tags result as (monotonic timestamp, base_url, models)
+        self._models_cache: Optional[tuple[float, str, List[str]]] = None
+        # In-flight /api/tags request, shared by concurrent callers
+        self._models_task: Optional[asyncio.Task] = None
 
         # Load configuration
         self._load_config()
@@ -33,7 +96,7 @@ class OllamaProvider(AIProvider):
         try:
             config = self.settings.get_ai_provider_config("ollama")
             self.base_url = config.get("base_url", "http://localhost:11434")
-            self.model = config.get("model", "llama3.1:latest")
+            self.model = config.get("model", _DEFAULT_MODEL)
             self.max_tokens = config.get("max_tokens", 2000)
             self.temperature = config.get("temperature", 0.7)
         except Exception as e:
@@ -46,135 +109,251 @@ class OllamaProvider(AIProvider):
         return bool(self.base_url and self.model)
 
     def test_connection(self) -> bool:
+        """Test connection to Ollama server and check if model exists."""
+        return run_sync(self.test_connection_async(), timeout=10)
+
+    async def test_connection_async(self) -> bool:
         """Test connection to Ollama server and check if model exists."""
         if not self.is_configured():
             return False
 
         try:
-            # Use synchronous requests for connection testing
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if "models" in data:
-                    # Check if the configured model exists
-                    available_models = [model["name"] for model in data.get("models", [])]
-                    return self.model in available_models
-                return False
-            return False
+            return self.model in await self._fetch_models()
         except Exception as e:
             self.logger.error(f"Ollama connection test failed: {e}")
             return False
 
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the provider's HTTP session, creating it on first use in this loop."""
+        import aiohttp
+        loop = asyncio.get_running_loop()
+        session = self._session
+        if session is None or session.closed or self._session_loop is not loop:
+            # Sessions can't be shared between loops (e.g. asyncio.run in tests)
+            if session is not None and not session.closed:
+                await self._close_session_from_other_loop(session, self._session_loop)
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=300)
+            )
+            self._session = session
+            self._session_loop = loop
+        return session
+
+    @staticmethod
+    async def _close_session_from_other_loop(
+        session: "aiohttp.ClientSession",
+        session_loop: asyncio.AbstractEventLoop
+    ):
+        """Close a session that belongs to another event loop."""
+        if session_loop.is_closed():
+            # Its transports went with the loop, so closing schedules nothing
+            await session.close()
+        else:
+            asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+
+    async def aclose(self):
+        """Close the persistent HTTP session."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
     async def _test_api_call(self) -> bool:
         """Test Ollama API with a simple call."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return "models" in data
-                    return False
+            session = await self._get_session()
+            async with session.get(f"{self.base_url}/api/tags") as response:
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    return "models" in data
+                return False
         except Exception:
             return False
 
+    async def _stream_generate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Call /api/generate with streaming on and yield each decoded JSON line."""
+        request_data = dict(self._get_request_template())
+        request_data["prompt"] = prompt
+
+        # Only build fresh options when the call overrides the defaults
+        if max_tokens or temperature is not None or kwargs:
+            request_data["options"] = {
+                "num_predict": max_tokens or self.max_tokens,
+                "temperature": temperature if temperature is not None else self.temperature,
+                **kwargs
+            }
+
+        # Make API call (the session's default timeout is 5 minutes)
+        session = await self._get_session()
+        async with session.post(
+            f"{self.base_url}/api/generate",
+            data=_json_dumps(request_data),
+            headers=_JSON_HEADERS
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise ValueError(f"Ollama API error: {response.status} - {error_text}")
+
+            # One JSON object per line, parsed straight from bytes
+            async for line in response.content:
+                if line.strip():
+                    yield _json_loads(line)
+
+    def _get_request_template(self) -> Dict[str, Any]:
+        """Get the request fields shared by every call with the current settings."""
+        key = (self.model, self.max_tokens, self.temperature)
+        template = self._request_template
+        if template is None or template[0] != key:
+            template = (key, {
+                "model": self.model,
+                "stream": True,
+                "options": {
+                    "num_predict": self.max_tokens,
+                    "temperature": self.temperature
+                }
+            })
+            self._request_template = template
+        return template[1]
+
     async def generate_text(
         self,
         prompt: str,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        use_cache: Optional[bool] = None,
         **kwargs
     ) -> AIResponse:
         """Generate text using Ollama."""
-        # Use provided parameters or defaults
-        max_tokens = max_tokens or self.max_tokens
-        temperature = temperature if temperature is not None else self.temperature
+        cache_key = self._response_cache_key(
+            prompt,
+            max_tokens or self.max_tokens,
+            temperature if temperature is not None else self.temperature,
+            use_cache,
+            kwargs
+        )
+        if cache_key is not None:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         try:
-            # Prepare request data
-            request_data = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                    **kwargs
-                }
-            }
-
-            # Make API call
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/generate",
-                    json=request_data,
-                    timeout=aiohttp.ClientTimeout(total=300)  # 5 minute timeout
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise ValueError(f"Ollama API error: {response.status} - {error_text}")
-
-                    data = await response.json()
-
-            # Extract response data
-            text = data.get("response", "").strip()
-
-            # Calculate token usage (approximate)
-            tokens_used = len(prompt.split()) + len(text.split())
-
-            return AIResponse(
+            fragments = []
+            data = {}
+            async for data in self._stream_generate(prompt, max_tokens, temperature, **kwargs):
+                fragments.append(data.get("response", ""))
+
+            # The final ("done") line carries the stats
+            text = "".join(fragments).strip()
+
+            # Ollama reports real token counts; estimate only if they're missing
+            prompt_tokens = data.get("prompt_eval_count")
+            if prompt_tokens is None:
+                prompt_tokens = _estimate_tokens(prompt)
+            completion_tokens = data.get("eval_count")
+            if completion_tokens is None:
+                completion_tokens = _estimate_tokens(text)
+            tokens_used = prompt_tokens + completion_tokens
+
+            result = AIResponse(
                 text=text,
                 model=self.model,
                 provider=self.name,
                 tokens_used=tokens_used,
-                finish_reason="stop",
+                finish_reason=data.get("done_reason", "stop"),
                 metadata={
-                    "prompt_tokens": len(prompt.split()),
-                    "completion_tokens": len(text.split()),
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
                     "total_duration": data.get("total_duration"),
                     "load_duration": data.get("load_duration"),
                     "eval_duration": data.get("eval_duration"),
                     "eval_count": data.get("eval_count")
                 }
             )
+            if cache_key is not None:
+                self._response_cache.put(cache_key, result)
+            return result
 
         except Exception as e:
             self.logger.error(f"Ollama generation error: {e}")
             raise ValueError(f"Ollama API error: {str(e)}")
 
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Generate text using Ollama, yielding fragments as they arrive."""
+        try:
+            async for data in self._stream_generate(prompt, max_tokens, temperature, **kwargs):
+                fragment = data.get("response")
+                if fragment:
+                    yield fragment
+        except Exception as e:
+            self.logger.error(f"Ollama streaming error: {e}")
+            raise ValueError(f"Ollama API error: {str(e)}")
+
     def get_available_models(self) -> List[str]:
         """Get list of available Ollama models."""
         try:
-            # Try synchronous approach first
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                models = [model["name"] for model in data.get("models", [])]
-                if models:
-                    return models
-            
-            # Fallback to async if sync fails
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                return [self.model]  # Return current model if in async context
-            else:
-                # Get available models from API
-                response = asyncio.run(self._get_models_api())
-                return response
+            return run_sync(self.get_available_models_async(), timeout=10)
         except Exception as e:
             self.logger.error(f"Error getting Ollama models: {e}")
             return [self.model]  # Fallback to current model
 
-    async def _get_models_api(self) -> List[str]:
-        """Get available models from Ollama API."""
+    def get_cached_models(self) -> List[str]:
+        """Get the model list from the last /api/tags listing for the current server."""
+        cached = self._models_cache
+        if cached is None or cached[1] != self.base_url:
+            return []
+        return list(cached[2])
+
+    async def get_available_models_async(self) -> List[str]:
+        """Get list of available Ollama models."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [model["name"] for model in data.get("models", [])]
-                    return [self.model]
-        except Exception:
-            return [self.model]
+            return await self._fetch_models()
+        except Exception as e:
+            self.logger.error(f"Error getting Ollama models: {e}")
+            return [self.model]  # Fallback to current model
+
+    async def _fetch_models(self) -> List[str]:
+        """Get installed model names, sharing one /api/tags request per 5 seconds."""
+        cached = self._models_cache
+        if (
+            cached is not None
+            and cached[1] == self.base_url
+            and time.monotonic() - cached[0] < _MODELS_TTL
+        ):
+            return list(cached[2])
+
+        # Concurrent probes (status, model list, existence check) await one request
+        task = self._models_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._request_models())
+            self._models_task = task
+        return list(await asyncio.shield(task))
+
+    async def _request_models(self) -> List[str]:
+        """Fetch installed model names from the Ollama API, raising on failure."""
+        base_url = self.base_url
+        session = await self._get_session()
+        async with session.get(
+            f"{self.base_url}/api/tags",
+            timeout=_client_timeout(5)
+        ) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+            models = [model["name"] for model in data.get("models", [])]
+
+        self._models_cache = (time.monotonic(), base_url, models)
+        return models
 
     def get_model_info(self, model: str) -> Dict[str, Any]:
         """Get information about a specific Ollama model."""
@@ -187,7 +366,19 @@ class OllamaProvider(AIProvider):
             "description": f"Local Ollama {model} model"
         }
 
-    def update_config(self, base_url: str, model: str = "llama3.1:latest"):
+    def default_config(self) -> Dict[str, Any]:
+        """Get default Ollama configuration."""
+        return {"base_url": "http://localhost:11434", "model": _DEFAULT_MODEL}
+
+    def apply_config(self, config: Dict[str, Any]):
+        """Apply an Ollama configuration dict."""
+        defaults = self.default_config()
+        self.update_config(
+            config.get("base_url", defaults["base_url"]),
+            config.get("model", defaults["model"])
+        )
+
+    def update_config(self, base_url: str, model: str = _DEFAULT_MODEL):
         """Update Ollama configuration."""
         self.base_url = base_url
         self.model = model
@@ -200,21 +391,13 @@ class OllamaProvider(AIProvider):
             "temperature": self.temperature
         }
         self.settings.set_ai_provider_config("ollama", config)
+        self.invalidate_connection_cache()
 
         self.logger.info(f"Updated Ollama config: base_url={base_url}, model={model}")
 
     def validate_base_url(self, base_url: str) -> bool:
         """Validate Ollama base URL format."""
-        if not base_url:
-            return False
-
-        try:
-            # Basic URL validation
-            from urllib.parse import urlparse
-            parsed = urlparse(base_url)
-            return bool(parsed.scheme and parsed.netloc)
-        except Exception:
-            return False
+        return _validate_base_url(base_url)
 
     def get_usage_info(self) -> Dict[str, Any]:
         """Get Ollama usage information."""
@@ -230,41 +413,39 @@ class OllamaProvider(AIProvider):
     def pull_model(self, model_name: str) -> bool:
         """Pull a model from Ollama registry."""
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                return False  # Can't pull in async context
-            else:
-                return asyncio.run(self._pull_model_async(model_name))
+            return run_sync(self.pull_model_async(model_name))
         except Exception as e:
             self.logger.error(f"Error pulling model {model_name}: {e}")
             return False
 
-    async def _pull_model_async(self, model_name: str) -> bool:
+    async def pull_model_async(self, model_name: str) -> bool:
         """Pull model asynchronously."""
         try:
             request_data = {"name": model_name}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/pull",
-                    json=request_data,
-                    timeout=aiohttp.ClientTimeout(total=600)  # 10 minute timeout for pulls
-                ) as response:
-                    if response.status == 200:
-                        # Stream the response to show progress
-                        async for line in response.content:
-                            if line:
-                                try:
-                                    data = json.loads(line.decode())
-                                    if "status" in data:
-                                        self.logger.info(f"Pull progress: {data['status']}")
-                                except json.JSONDecodeError:
-                                    pass
-                        return True
-                    else:
-                        error_text = await response.text()
-                        self.logger.error(f"Pull failed: {response.status} - {error_text}")
-                        return False
+            session = await self._get_session()
+            async with session.post(
+                f"{self.base_url}/api/pull",
+                json=request_data,
+                timeout=_client_timeout(600)  # 10 minute timeout for pulls
+            ) as response:
+                if response.status == 200:
+                    # Stream the response to show progress
+                    async for line in response.content:
+                        if line:
+                            try:
+                                data = _json_loads(line)
+                                if "status" in data:
+                                    self.logger.info(f"Pull progress: {data['status']}")
+                            except json.JSONDecodeError:
+                                pass
+                    # The installed model list just changed
+                    self._models_cache = None
+                    return True
+                else:
+                    error_text = await response.text()
+                    self.logger.error(f"Pull failed: {response.status} - {error_text}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error pulling model: {e}")
             return False
@@ -272,82 +453,14 @@ class OllamaProvider(AIProvider):
     def check_model_exists(self, model_name: str) -> bool:
         """Check if a model exists locally."""
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                return model_name == self.model  # Assume current model exists
-            else:
-                models = asyncio.run(self._get_models_api())
-                return model_name in models
+            return run_sync(self.check_model_exists_async(model_name), timeout=10)
         except Exception:
             return model_name == self.model  # Fallback
 
-
-class OllamaProviderSync(OllamaProvider):
-    """Synchronous version of Ollama provider for compatibility."""
-
-    def __init__(self, settings: Settings):
-        """Initialize synchronous Ollama provider."""
-        super().__init__(settings)
-
-    async def generate_text(
-        self,
-        prompt: str,
-        max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None,
-        **kwargs
-    ) -> AIResponse:
-        """Generate text using Ollama (sync version)."""
-        # Use provided parameters or defaults
-        max_tokens = max_tokens or self.max_tokens
-        temperature = temperature if temperature is not None else self.temperature
-
+    async def check_model_exists_async(self, model_name: str) -> bool:
+        """Check if a model exists locally."""
         try:
-            # Prepare request data
-            request_data = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": max_tokens,
-                    "temperature": temperature,
-                    **kwargs
-                }
-            }
-
-            # Make synchronous API call
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=request_data,
-                timeout=300  # 5 minute timeout
-            )
-
-            if response.status_code != 200:
-                raise ValueError(f"Ollama API error: {response.status_code} - {response.text}")
-
-            data = response.json()
-
-            # Extract response data
-            text = data.get("response", "").strip()
-
-            # Calculate token usage (approximate)
-            tokens_used = len(prompt.split()) + len(text.split())
-
-            return AIResponse(
-                text=text,
-                model=self.model,
-                provider=self.name,
-                tokens_used=tokens_used,
-                finish_reason="stop",
-                metadata={
-                    "prompt_tokens": len(prompt.split()),
-                    "completion_tokens": len(text.split()),
-                    "total_duration": data.get("total_duration"),
-                    "load_duration": data.get("load_duration"),
-                    "eval_duration": data.get("eval_duration"),
-                    "eval_count": data.get("eval_count")
-                }
-            )
+            return model_name in await self._fetch_models()
+        except Exception:
+            return model_name == self.model  # Fallback
 
-        except Exception as e:
-            self.logger.error(f"Ollama generation error: {e}")
-            raise ValueError(f"Ollama API error: {str(e)}")
@@ -3,24 +3,53 @@
 DevBlogger - OpenAI ChatGPT provider
 """
 
-import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import os
 
-try:
-    import openai
-    from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    openai = None
-    AsyncOpenAI = None
-
-from .base import AIProvider, AIResponse
+from .base import AIProvider, AIResponse, in_running_loop, run_sync
 from ..config.settings import Settings
 
 
+# The openai SDK (httpx, pydantic) is imported on first use to keep startup fast.
+# OPENAI_AVAILABLE is None until the import has been attempted.
+AsyncOpenAI = None
+OPENAI_AVAILABLE: Optional[bool] = None
+
+
+def _load_openai():
+    """Import the AsyncOpenAI client class on first use; return it or None."""
+    global AsyncOpenAI, OPENAI_AVAILABLE
+    if OPENAI_AVAILABLE is None:
+        try:
+            from openai import AsyncOpenAI as _client_class
+        except ImportError:
+            OPENAI_AVAILABLE = False
+        else:
+            AsyncOpenAI = _client_class
+            OPENAI_AVAILABLE = True
+    return AsyncOpenAI if OPENAI_AVAILABLE else None
+
+
+# Constant system message; keeping the prefix identical across calls also lets
+# the API serve it from its prompt cache
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful assistant that writes professional development blog entries."
+}
+
+
+@lru_cache(maxsize=64)
+def _validate_api_key(api_key: str) -> bool:
+    """Check an OpenAI API key's format (memoized; called on every refresh)."""
+    if not api_key:
+        return False
+
+    # OpenAI API keys start with 'sk-'
+    return api_key.startswith("sk-") and len(api_key) > 20
+
+
 class OpenAIProvider(AIProvider):
     """OpenAI ChatGPT provider."""
 
@@ -29,14 +58,35 @@ class OpenAIProvider(AIProvider):
         super().__init__("chatgpt", "gpt-4")
 
         self.settings = settings
-        self.client: Optional[AsyncOpenAI] = None
+        self.client: Optional["AsyncOpenAI"] = None
         self.api_key = ""
 
         # Load configuration
         self._load_config()
 
-        if OPENAI_AVAILABLE and self.api_key:
-            self.client = AsyncOpenAI(api_key=self.api_key)
+        self._set_client_key(self.api_key)
+
+    def _set_client_key(self, api_key: str):
+        """Point the client at api_key, reusing its connection pool when one exists."""
+        client_class = _load_openai() if api_key else None
+        if client_class is None:
+            # AsyncOpenAI refuses to be constructed without a key
+            self.client = None
+        elif self.client is None:
+            self.client = client_class(
+                api_key=api_key,
+                max_retries=2,
+                timeout=300.0
+            )
+        elif self.client.api_key != api_key:
+            # with_options shares the underlying httpx.AsyncClient
+            self.client = self.client.with_options(api_key=api_key)
+
+    async def aclose(self):
+        """Close the client's HTTP connection pool."""
+        client, self.client = self.client, None
+        if client is not None:
+            await client.close()
 
     def _load_config(self):
         """Load OpenAI configuration from settings."""
@@ -51,7 +101,8 @@ class OpenAIProvider(AIProvider):
 
     def is_configured(self) -> bool:
         """Check if OpenAI is properly configured."""
-        return bool(self.api_key and OPENAI_AVAILABLE)
+        # The client only exists once the SDK has been imported with a key
+        return bool(self.api_key and self.client)
 
     def test_connection(self) -> bool:
         """Test connection to OpenAI API."""
@@ -78,9 +129,11 @@ class OpenAIProvider(AIProvider):
         prompt: str,
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        use_cache: Optional[bool] = None,
         **kwargs
     ) -> AIResponse:
-        """Generate text using OpenAI ChatGPT."""
+        """Generate text using OpenAI ChatGPT, optionally with a custom system prompt."""
         if not self.client:
             raise ValueError("OpenAI client not initialized")
 
@@ -88,14 +141,21 @@ class OpenAIProvider(AIProvider):
         max_tokens = max_tokens or self.max_tokens
         temperature = temperature if temperature is not None else self.temperature
 
+        cache_key = self._response_cache_key(
+            prompt, max_tokens, temperature, use_cache, dict(kwargs, system=system)
+        )
+        if cache_key is not None:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        system_message = _SYSTEM_MESSAGE if system is None else {"role": "system", "content": system}
+
         try:
             # Create chat completion
             response = await self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that writes professional development blog entries."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=[system_message, {"role": "user", "content": prompt}],
                 max_tokens=max_tokens,
                 temperature=temperature,
                 **kwargs
@@ -110,7 +170,7 @@ class OpenAIProvider(AIProvider):
             if response.usage:
                 tokens_used = response.usage.total_tokens
 
-            return AIResponse(
+            result = AIResponse(
                 text=text,
                 model=self.model,
                 provider=self.name,
@@ -123,6 +183,9 @@ class OpenAIProvider(AIProvider):
                     "id": response.id
                 }
             )
+            if cache_key is not None:
+                self._response_cache.put(cache_key, result)
+            return result
 
         except Exception as e:
             self.logger.error(f"OpenAI generation error: {e}")
@@ -134,11 +197,10 @@ class OpenAIProvider(AIProvider):
             return []
 
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
+            if in_running_loop():
                 return ["gpt-4", "gpt-3.5-turbo", "gpt-4-turbo-preview"]  # Common models
             else:
-                response = asyncio.run(self.client.models.list())
+                response = run_sync(self.client.models.list(), timeout=10)
                 return [model.id for model in response.data if "gpt" in model.id]
         except Exception as e:
             self.logger.error(f"Error getting OpenAI models: {e}")
@@ -155,6 +217,18 @@ class OpenAIProvider(AIProvider):
             "description": f"OpenAI {model} model"
         }
 
+    def default_config(self) -> Dict[str, Any]:
+        """Get default OpenAI configuration."""
+        return {"api_key": "", "model": "gpt-4"}
+
+    def apply_config(self, config: Dict[str, Any]):
+        """Apply an OpenAI configuration dict."""
+        defaults = self.default_config()
+        self.update_config(
+            config.get("api_key", defaults["api_key"]),
+            config.get("model", defaults["model"])
+        )
+
     def update_config(self, api_key: str, model: str = "gpt-4"):
         """Update OpenAI configuration."""
         self.api_key = api_key
@@ -168,20 +242,15 @@ class OpenAIProvider(AIProvider):
             "temperature": self.temperature
         }
         self.settings.set_ai_provider_config("chatgpt", config)
+        self.invalidate_connection_cache()
 
-        # Reinitialize client
-        if OPENAI_AVAILABLE:
-            self.client = AsyncOpenAI(api_key=api_key)
+        self._set_client_key(api_key)
 
         self.logger.info(f"Updated OpenAI config: model={model}")
 
     def validate_api_key(self, api_key: str) -> bool:
         """Validate OpenAI API key format."""
-        if not api_key:
-            return False
-
-        # OpenAI API keys start with 'sk-'
-        return api_key.startswith("sk-") and len(api_key) > 20
+        return _validate_api_key(api_key)
 
     def get_usage_info(self) -> Dict[str, Any]:
         """Get OpenAI usage information."""
@@ -195,73 +264,3 @@ class OpenAIProvider(AIProvider):
             "temperature": self.temperature,
             "api_key_valid": self.validate_api_key(self.api_key)
         }
-
-
-class OpenAIProviderSync(OpenAIProvider):
-    """Synchronous version of OpenAI provider for compatibility."""
-
-    def __init__(self, settings: Settings):
-        """Initialize synchronous OpenAI provider."""
-        super().__init__(settings)
-
-        if OPENAI_AVAILABLE and self.api_key:
-            # Use sync client for compatibility
-            import openai
-            self.sync_client = openai.OpenAI(api_key=self.api_key)
-        else:
-            self.sync_client = None
-
-    async def generate_text(
-        self,
-        prompt: str,
-        max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None,
-        **kwargs
-    ) -> AIResponse:
-        """Generate text using OpenAI ChatGPT (sync version)."""
-        if not self.sync_client:
-            raise ValueError("OpenAI client not initialized")
-
-        # Use provided parameters or defaults
-        max_tokens = max_tokens or self.max_tokens
-        temperature = temperature if temperature is not None else self.temperature
-
-        try:
-            # Create chat completion using sync client
-            response = self.sync_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that writes professional development blog entries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs
-            )
-
-            # Extract response data
-            choice = response.choices[0]
-            text = choice.message.content.strip()
-
-            # Get token usage
-            tokens_used = None
-            if response.usage:
-                tokens_used = response.usage.total_tokens
-
-            return AIResponse(
-                text=text,
-                model=self.model,
-                provider=self.name,
-                tokens_used=tokens_used,
-                finish_reason=choice.finish_reason,
-                metadata={
-                    "prompt_tokens": response.usage.prompt_tokens if response.usage else None,
-                    "completion_tokens": response.usage.completion_tokens if response.usage else None,
-                    "model": response.model,
-                    "id": response.id
-                }
-            )
-
-        except Exception as e:
-            self.logger.error(f"OpenAI generation error: {e}")
-            raise ValueError(f"OpenAI API error: {str(e)}")
@@ -5,17 +5,52 @@ DevBlogger - Blog Generation Engine
 
 import logging
 import asyncio
+import hashlib
+import inspect
+import io
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 import re
 
+from ..ai.base import run_sync
 from ..ai.manager import DevBloggerAIProviderManager
 from ..github.models import GitHubCommit
 from ..config.settings import Settings
 from ..config.database import DatabaseManager
 
 
+# Patterns used to tidy AI output in _clean_ai_content
+_EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+_HEADER_RE = re.compile(r'^(#{1,6} .+)$', re.MULTILINE)
+# Applied in order: a marker's \s* may swallow a newline, so each pass must
+# see the previous pass's output
+_LIST_MARKER_RES = (
+    re.compile(r'^(\d+\.)\s*', re.MULTILINE),
+    re.compile(r'^(\*)\s*', re.MULTILINE),
+    re.compile(r'^(-)\s*', re.MULTILINE),
+)
+
+# Prompt used when neither the caller nor the settings provide one
+_DEFAULT_PROMPT = (
+    "Write a concise, informative, and interesting development blog entry "
+    "based on the provided commit information. Focus on the most significant "
+    "changes and improvements. Write in first person as if you are the "
+    "developer describing your work. Keep the tone professional but engaging. "
+    "Highlight technical achievements, challenges overcome, and the impact "
+    "of the changes. Structure the post with a clear introduction, main content "
+    "describing the key changes, and a conclusion if appropriate."
+)
+
+# Timestamp embedded in generated blog entry filenames
+_FILENAME_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Frontmatter block and its "key: value" lines, used by _extract_metadata_from_content
+_FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n', re.DOTALL)
+_FRONTMATTER_KV_RE = re.compile(r'^([^:\n]*):(.*)$', re.MULTILINE)
+
+
 class BlogGenerationError(Exception):
     """Exception raised during blog generation."""
     pass
@@ -38,9 +73,48 @@ class BlogGenerator:
         prompt: Optional[str] = None,
         provider: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        force: bool = False,
+        use_cache: bool = False
     ) -> Dict[str, Any]:
-        """Generate a blog entry from commits."""
+        """Generate a blog entry from commits, reusing a cached AI response when requested or deterministic."""
+        return run_sync(self._generate_async(
+            commits,
+            repository,
+            prompt=prompt,
+            provider=provider,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            force=force,
+            use_cache=use_cache
+        ))
+
+    async def generate_blog_entries_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[Any]:
+        """Generate several blog entries concurrently, returning results or exceptions in job order."""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._generate_async(**job)
+
+        return await asyncio.gather(*(run_job(job) for job in jobs), return_exceptions=True)
+
+    async def _generate_async(
+        self,
+        commits: List[GitHubCommit],
+        repository: str,
+        prompt: Optional[str] = None,
+        provider: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        force: bool = False,
+        use_cache: bool = False
+    ) -> Dict[str, Any]:
+        """Generate a blog entry from commits on the running event loop."""
         if not commits:
             raise BlogGenerationError("No commits provided for blog generation")
 
@@ -65,52 +139,67 @@ class BlogGenerator:
         if not ai_provider or not ai_provider.is_configured():
             raise BlogGenerationError(f"AI provider '{provider}' is not configured")
 
-        try:
-            # Prepare commit data
-            commit_data = self._prepare_commit_data(commits, repository)
+        if not hasattr(ai_provider, 'generate_text'):
+            raise BlogGenerationError(f"Provider {provider} does not support text generation")
 
-            # Generate blog content
+        try:
+            # Settings the provider will actually generate with
+            effective_max_tokens = max_tokens or getattr(ai_provider, 'max_tokens', None)
+            effective_temperature = temperature if temperature is not None else getattr(ai_provider, 'temperature', None)
+
+            # Prepare commit data, leaving room for the prompt and the completion
+            token_budget = (
+                ai_provider.max_context_tokens()
+                - (effective_max_tokens or 0)
+                - len(prompt) // 4
+            )
+            commit_data = self._prepare_commit_data(commits, repository, token_budget)
             full_prompt = f"{prompt}\n\n{commit_data}"
 
-            # Use async generation if available
-            if hasattr(ai_provider, 'generate_text'):
-                # Check if it's a coroutine function
-                import inspect
-                if inspect.iscoroutinefunction(ai_provider.generate_text):
-                    # Run async generation
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        # We're in an async context, need to handle differently
-                        raise BlogGenerationError("Async generation not supported in current context")
-                    else:
-                        response = loop.run_until_complete(
-                            ai_provider.generate_text(
-                                prompt=full_prompt,
-                                max_tokens=max_tokens,
-                                temperature=temperature
-                            )
-                        )
-                else:
-                    # Synchronous generation
-                    response = ai_provider.generate_text(
-                        prompt=full_prompt,
-                        max_tokens=max_tokens,
-                        temperature=temperature
-                    )
+            # Only deterministic generations are reused unless the caller asks for the cache
+            cache_key = self._generation_cache_key(
+                full_prompt, provider, ai_provider.model, effective_max_tokens, effective_temperature
+            )
+            cached = None
+            if not force and (use_cache or effective_temperature == 0):
+                cached = await asyncio.to_thread(self.database.get_cached_generation, cache_key)
+
+            if cached:
+                self.logger.info(f"Using cached AI response for {repository}")
+                ai_text = cached["content"]
+                model = cached["metadata"].get("model", ai_provider.model)
+                tokens_used = cached["metadata"].get("tokens_used")
             else:
-                raise BlogGenerationError(f"Provider {provider} does not support text generation")
+                # gen_cache is the only cache on this path, so force really regenerates
+                response = ai_provider.generate_text(
+                    prompt=full_prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    use_cache=False
+                )
+                if inspect.isawaitable(response):
+                    response = await response
+                ai_text = response.text
+                model = response.model
+                tokens_used = getattr(response, 'tokens_used', None)
+                await asyncio.to_thread(
+                    self.database.cache_generation, cache_key, ai_text,
+                    {"model": model, "tokens_used": tokens_used}
+                )
 
-            # Create blog entry
+            # Create blog entry; cached responses still get a fresh timestamp and frontmatter
+            generated_at = datetime.now()
             blog_content = self._format_blog_entry(
-                response.text,
+                ai_text,
                 commits,
                 repository,
                 provider,
-                response.model
+                model,
+                generated_at
             )
 
-            # Mark commits as processed
-            self._mark_commits_processed(commits, repository, provider)
+            # Mark commits as processed without blocking the loop on SQLite
+            await asyncio.to_thread(self._mark_commits_processed, commits, repository, provider)
 
             return {
                 "success": True,
@@ -119,9 +208,11 @@ class BlogGenerator:
                     "repository": repository,
                     "commit_count": len(commits),
                     "provider": provider,
-                    "model": response.model,
-                    "tokens_used": getattr(response, 'tokens_used', None),
-                    "generated_at": datetime.now().isoformat()
+                    "model": model,
+                    "tokens_used": tokens_used,
+                    "generated_at": generated_at.isoformat(),
+                    "generated_at_dt": generated_at,
+                    "cached": bool(cached)
                 }
             }
 
@@ -129,45 +220,73 @@ class BlogGenerator:
             self.logger.error(f"Error generating blog entry: {e}")
             raise BlogGenerationError(f"Failed to generate blog entry: {str(e)}")
 
-    def _prepare_commit_data(self, commits: List[GitHubCommit], repository: str) -> str:
-        """Prepare commit data for AI processing."""
-        sections = []
+    @staticmethod
+    def _generation_cache_key(
+        full_prompt: str,
+        provider: str,
+        model: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float]
+    ) -> str:
+        """Build the generation cache key from the exact prompt sent and the generation settings."""
+        digest = hashlib.blake2b(digest_size=32)
+        for part in (full_prompt, provider, model, max_tokens, temperature):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _prepare_commit_data(
+        self,
+        commits: List[GitHubCommit],
+        repository: str,
+        token_budget: Optional[int] = None
+    ) -> str:
+        """Prepare commit data for AI processing, stopping once token_budget would be exceeded."""
+        buf = io.StringIO()
+        # Roughly four characters per token; keep a margin for the estimate's error
+        char_budget = int(token_budget * 4 * 0.9) if token_budget is not None else None
 
         # Repository header
-        sections.append(f"Repository: {repository}")
-        sections.append(f"Total Commits: {len(commits)}")
-        sections.append("")
+        buf.write(f"Repository: {repository}\nTotal Commits: {len(commits)}\n")
 
         # Individual commits
         for i, commit in enumerate(commits, 1):
-            sections.append(f"--- Commit {i} ---")
-            sections.append(f"SHA: {commit.sha}")
-            sections.append(f"Author: {commit.author.name or commit.author.login or 'Unknown'}")
-            sections.append(f"Date: {commit.date.strftime('%Y-%m-%d %H:%M:%S') if commit.date else 'Unknown'}")
-            sections.append(f"Message: {commit.message}")
+            section_start = buf.tell()
+            author = commit.author.name or commit.author.login or 'Unknown'
+            # isoformat is much cheaper than strftime; slicing drops any UTC offset
+            date = commit.date.isoformat(' ', 'seconds')[:19] if commit.date else 'Unknown'
+            buf.write(
+                f"\n--- Commit {i} ---\n"
+                f"SHA: {commit.sha}\n"
+                f"Author: {author}\n"
+                f"Date: {date}\n"
+                f"Message: {commit.message}\n"
+            )
 
             # File changes
             if commit.files:
-                sections.append("Files Changed:")
+                buf.write("Files Changed:\n")
                 for file_info in commit.files[:10]:  # Limit to first 10 files
-                    filename = file_info.get('filename', 'Unknown')
-                    status = file_info.get('status', 'Unknown')
                     additions = file_info.get('additions', 0)
                     deletions = file_info.get('deletions', 0)
-
-                    change_info = f"  {status} {filename}"
-                    if additions:
-                        change_info += f" (+{additions})"
-                    if deletions:
-                        change_info += f" (-{deletions})"
-                    sections.append(change_info)
+                    buf.write(
+                        f"  {file_info.get('status', 'Unknown')} {file_info.get('filename', 'Unknown')}"
+                        f"{f' (+{additions})' if additions else ''}"
+                        f"{f' (-{deletions})' if deletions else ''}\n"
+                    )
 
                 if len(commit.files) > 10:
-                    sections.append(f"  ... and {len(commit.files) - 10} more files")
+                    buf.write(f"  ... and {len(commit.files) - 10} more files\n")
 
-            sections.append("")
+            # Always keep the first commit so the model has something to write about
+            if char_budget is not None and i > 1 and buf.tell() > char_budget:
+                buf.seek(section_start)
+                buf.truncate()
+                buf.write(f"\n... {len(commits) - i + 1} more commits truncated to fit the model context\n")
+                self.logger.info(f"Truncated commit data for {repository} after {i - 1} of {len(commits)} commits")
+                break
 
-        return "\n".join(sections)
+        return buf.getvalue()
 
     def _format_blog_entry(
         self,
@@ -175,21 +294,22 @@ class BlogGenerator:
         commits: List[GitHubCommit],
         repository: str,
         provider: str,
-        model: str
+        model: str,
+        timestamp: Optional[datetime] = None
     ) -> str:
         """Format the AI-generated content into a proper blog entry."""
         # Generate metadata
-        timestamp = datetime.now()
+        timestamp = timestamp or datetime.now()
         repo_name = repository.split('/')[-1]
 
         # Create frontmatter
         frontmatter = f"""---
 title: Development Update - {repo_name}
-date: {timestamp.strftime('%Y-%m-%d')}
+date: {timestamp.date().isoformat()}
 repository: {repository}
 commit_count: {len(commits)}
 generated_by: {provider} ({model})
-generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
+generated_at: {timestamp.isoformat(' ', 'seconds')}
 ---
 
 """
@@ -208,19 +328,14 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
             return ""
 
         # Remove excessive newlines
-        content = re.sub(r'\n{3,}', '\n\n', content)
+        content = _EXCESS_NEWLINES_RE.sub('\n\n', content)
 
         # Ensure proper spacing after headers
-        content = re.sub(r'^(#{1,6} .+)$', r'\1\n', content, flags=re.MULTILINE)
+        content = _HEADER_RE.sub(r'\1\n', content)
 
         # Fix list formatting
-        content = re.sub(r'^(\d+\.)\s*', r'\1 ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(\*)\s*', r'\1 ', content, flags=re.MULTILINE)
-        content = re.sub(r'^(-)\s*', r'\1 ', content, flags=re.MULTILINE)
-
-        # Ensure content ends with newline
-        if not content.endswith('\n'):
-            content += '\n'
+        for pattern in _LIST_MARKER_RES:
+            content = pattern.sub(r'\1 ', content)
 
         return content.strip()
 
@@ -229,37 +344,25 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
         if not commits:
             return ""
 
-        references = [
-            "",
-            "## Commit Details",
-            "",
-            "The following commits were included in this update:",
-            ""
-        ]
+        buf = io.StringIO()
+        buf.write("\n## Commit Details\n\nThe following commits were included in this update:\n\n")
 
         for commit in commits:
-            short_sha = commit.sha[:8]
             author = commit.author.name or commit.author.login or "Unknown"
-            date = commit.date.strftime('%Y-%m-%d %H:%M') if commit.date else "Unknown"
-            message = commit.message.split('\n')[0]  # First line only
+            date = commit.date.isoformat(' ', 'minutes')[:16] if commit.date else "Unknown"
+            message = commit.message.partition('\n')[0]  # First line only
 
-            references.append(f"- **{short_sha}** by {author} on {date}: {message}")
+            buf.write(f"- **{commit.sha[:8]}** by {author} on {date}: {message}\n")
 
-        references.append("")
-        return "\n".join(references)
+        return buf.getvalue()
 
     def _mark_commits_processed(self, commits: List[GitHubCommit], repository: str, provider: str):
         """Mark commits as processed in the database."""
-        for commit in commits:
-            try:
-                self.database.mark_commit_processed(
-                    repo_name=repository,
-                    commit_sha=commit.sha,
-                    ai_provider=provider
-                )
-                self.logger.debug(f"Marked commit {commit.sha} as processed")
-            except Exception as e:
-                self.logger.warning(f"Failed to mark commit {commit.sha} as processed: {e}")
+        shas = [commit.sha for commit in commits]
+        if self.database.mark_commits_processed_bulk(repository, shas, ai_provider=provider):
+            self.logger.debug(f"Marked {len(shas)} commits as processed")
+        else:
+            self.logger.warning(f"Failed to mark {len(shas)} commits as processed")
 
     def save_blog_entry(self, content: str, repository: str, custom_filename: Optional[str] = None) -> Path:
         """Save blog entry to file."""
@@ -270,7 +373,7 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
                 if not filename.endswith('.md'):
                     filename += '.md'
             else:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                timestamp = datetime.now().strftime(_FILENAME_TIMESTAMP_FORMAT)
                 repo_name = repository.replace("/", "_")
                 filename = f"{repo_name}_{timestamp}.md"
 
@@ -282,8 +385,7 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
             filepath = output_dir / filename
 
             # Write content
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._write_file(filepath, content.encode('utf-8'))
 
             self.logger.info(f"Blog entry saved to: {filepath}")
             return filepath
@@ -292,6 +394,19 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
             self.logger.error(f"Error saving blog entry: {e}")
             raise BlogGenerationError(f"Failed to save blog entry: {str(e)}")
 
+    @staticmethod
+    def _write_file(filepath: Path, data: bytes):
+        """Write bytes to a file with one unbuffered write loop and flush them to disk."""
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            # fdatasync is unavailable on some platforms (e.g. macOS, Windows)
+            getattr(os, 'fdatasync', os.fsync)(fd)
+        finally:
+            os.close(fd)
+
     def regenerate_blog_entry(
         self,
         commits: List[GitHubCommit],
@@ -311,67 +426,87 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
             prompt=prompt,
             provider=new_provider,
             max_tokens=metadata.get('max_tokens'),
-            temperature=metadata.get('temperature')
+            temperature=metadata.get('temperature'),
+            force=True
+        )
+
+    async def regenerate_many(
+        self,
+        commits: List[GitHubCommit],
+        repository: str,
+        providers: List[str],
+        prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Regenerate a blog entry with several providers at once, mapping each to its result or exception."""
+        results = await asyncio.gather(
+            *(self._generate_async(commits, repository, prompt=prompt, provider=provider, force=True)
+              for provider in providers),
+            return_exceptions=True
         )
+        return dict(zip(providers, results))
+
+    @staticmethod
+    def read_frontmatter_block(filepath: Path) -> str:
+        """Read only the leading frontmatter block of a blog file, which is all regeneration needs."""
+        lines = []
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if f.readline() != '---\n':
+                return ""
+            lines.append('---\n')
+            for line in f:
+                lines.append(line)
+                # The closing marker must follow at least one frontmatter line
+                if line == '---\n' and len(lines) > 2:
+                    break
+        return ''.join(lines)
 
     def _extract_metadata_from_content(self, content: str) -> Dict[str, Any]:
         """Extract metadata from existing blog content."""
-        metadata = {}
-
-        # Simple regex to extract frontmatter
-        frontmatter_match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-        if frontmatter_match:
-            frontmatter = frontmatter_match.group(1)
-            for line in frontmatter.split('\n'):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    metadata[key.strip()] = value.strip()
+        frontmatter_match = _FRONTMATTER_RE.match(content)
+        if not frontmatter_match:
+            return {}
 
-        return metadata
+        return {
+            key.strip(): value.strip()
+            for key, value in _FRONTMATTER_KV_RE.findall(frontmatter_match.group(1))
+        }
 
     def get_generation_stats(self, commits: List[GitHubCommit]) -> Dict[str, Any]:
         """Get statistics about the commits for generation."""
         if not commits:
             return {}
 
-        stats = {
-            "total_commits": len(commits),
-            "authors": set(),
-            "files_changed": set(),
-            "additions": 0,
-            "deletions": 0,
-            "date_range": None
-        }
-
-        earliest_date = None
-        latest_date = None
+        authors = set()
+        files_changed = set()
+        additions = 0
+        deletions = 0
 
         for commit in commits:
-            # Authors
-            author_name = commit.author.name or commit.author.login or "Unknown"
-            stats["authors"].add(author_name)
+            authors.add(commit.author.name or commit.author.login or "Unknown")
 
-            # Files changed
             if commit.files:
                 for file_info in commit.files:
                     filename = file_info.get('filename', '')
                     if filename:
-                        stats["files_changed"].add(filename)
+                        files_changed.add(filename)
 
                     # Line changes
-                    stats["additions"] += file_info.get('additions', 0)
-                    stats["deletions"] += file_info.get('deletions', 0)
+                    additions += file_info.get('additions', 0)
+                    deletions += file_info.get('deletions', 0)
 
-            # Date range
-            if commit.date:
-                if earliest_date is None or commit.date < earliest_date:
-                    earliest_date = commit.date
-                if latest_date is None or commit.date > latest_date:
-                    latest_date = commit.date
+        dates = [commit.date for commit in commits if commit.date]
+        earliest_date = min(dates) if dates else None
+        latest_date = max(dates) if dates else None
 
-        stats["authors"] = list(stats["authors"])
-        stats["files_changed"] = list(stats["files_changed"])
-        stats["unique_files"] = len(stats["files_changed"])
+        stats = {
+            "total_commits": len(commits),
+            "authors": list(authors),
+            "files_changed": list(files_changed),
+            "additions": additions,
+            "deletions": deletions,
+            "date_range": None,
+            "unique_files": len(files_changed)
+        }
 
         if earliest_date and latest_date:
             stats["date_range"] = {
@@ -394,21 +529,15 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
             issues.append("Large number of commits selected - generation may be slow")
 
         # Check for empty or very short messages
-        short_messages = 0
-        for commit in commits:
-            if len(commit.message.strip()) < 10:
-                short_messages += 1
+        short_messages = sum(1 for commit in commits if len(commit.message.strip()) < 10)
 
         if short_messages > len(commits) * 0.5:  # More than 50% have short messages
             issues.append("Many commits have very short messages - blog quality may be affected")
 
         # Check for processed commits
-        processed_count = 0
         repository = getattr(commits[0], 'repository', '') if commits else ''
-
-        for commit in commits:
-            if self.database.is_commit_processed(repository, commit.sha):
-                processed_count += 1
+        processed = self.database.get_processed_shas(repository, [commit.sha for commit in commits])
+        processed_count = sum(1 for commit in commits if commit.sha in processed)
 
         if processed_count > 0:
             issues.append(f"{processed_count} commits have already been processed")
@@ -417,23 +546,11 @@ generated_at: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}
 
     def _get_default_prompt(self) -> str:
         """Get default prompt for blog generation."""
-        return (
-            "Write a concise, informative, and interesting development blog entry "
-            "based on the provided commit information. Focus on the most significant "
-            "changes and improvements. Write in first person as if you are the "
-            "developer describing your work. Keep the tone professional but engaging. "
-            "Highlight technical achievements, challenges overcome, and the impact "
-            "of the changes. Structure the post with a clear introduction, main content "
-            "describing the key changes, and a conclusion if appropriate."
-        )
+        return _DEFAULT_PROMPT
 
     def get_supported_providers(self) -> List[str]:
         """Get list of AI providers that support blog generation."""
-        providers = []
-        for name, provider in self.ai_manager.get_all_providers().items():
-            if provider.is_configured():
-                providers.append(name)
-        return providers
+        return self.ai_manager.get_configured_providers()
 
     def estimate_generation_time(self, commits: List[GitHubCommit], provider: str) -> Dict[str, Any]:
         """Estimate generation time based on commit count and provider."""
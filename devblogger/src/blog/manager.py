@@ -3,10 +3,12 @@
 DevBlogger - Blog Management Interface
 """
 
+import json
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Callable, Tuple
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 from pathlib import Path
 
 from .generator import BlogGenerator, BlogGenerationError
@@ -35,8 +37,10 @@ class BlogManager:
         # Core components
         self.generator = BlogGenerator(ai_manager, settings, database)
         self.storage = BlogStorageManager(settings)
+        # Serializes index updates when bulk generation saves from worker threads
+        self._storage_lock = threading.Lock()
 
-        # Event callbacks
+        # Event callbacks, always invoked on the thread that started the generation
         self.on_generation_start: Optional[Callable] = None
         self.on_generation_complete: Optional[Callable] = None
         self.on_generation_error: Optional[Callable] = None
@@ -53,16 +57,33 @@ class BlogManager:
         custom_filename: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate a blog entry from commits."""
+        # Notify start
+        if self.on_generation_start:
+            self.on_generation_start(repository, len(commits))
+
+        result = self._generate_and_store(
+            commits, repository, prompt, provider, max_tokens, temperature, custom_filename
+        )
+        self._notify_generation_result(result)
+        return result
+
+    def _generate_and_store(
+        self,
+        commits: List[GitHubCommit],
+        repository: str,
+        prompt: Optional[str] = None,
+        provider: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        custom_filename: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Generate and save a blog entry without invoking the event callbacks; safe on worker threads."""
         try:
             # Validate inputs
             issues = self.generator.validate_commits_for_generation(commits)
             if issues:
                 self.logger.warning(f"Validation issues: {issues}")
 
-            # Notify start
-            if self.on_generation_start:
-                self.on_generation_start(repository, len(commits))
-
             # Generate blog entry
             result = self.generator.generate_blog_entry(
                 commits=commits,
@@ -81,40 +102,43 @@ class BlogManager:
                     custom_filename
                 )
 
+                metadata = result["metadata"]
+                generated_at = metadata["generated_at_dt"]
+
                 # Create blog entry object
                 entry = BlogEntry(
                     filepath=filepath,
                     repository=repository,
                     commit_count=len(commits),
-                    provider=result["metadata"]["provider"],
-                    model=result["metadata"]["model"],
-                    generated_at=datetime.fromisoformat(result["metadata"]["generated_at"])
+                    provider=metadata["provider"],
+                    model=metadata["model"],
+                    generated_at=generated_at
                 )
 
                 # Add to storage
-                entry_id = self.storage.add_entry(entry)
+                with self._storage_lock:
+                    entry_id = self.storage.add_entry(entry)
 
                 result["entry_id"] = entry_id
                 result["filepath"] = str(filepath)
 
-            # Notify completion
-            if self.on_generation_complete and result["success"]:
-                self.on_generation_complete(result)
-
             return result
 
         except BlogGenerationError as e:
-            error_result = {
+            return {
                 "success": False,
                 "error": str(e),
                 "repository": repository,
                 "commit_count": len(commits)
             }
 
-            if self.on_generation_error:
-                self.on_generation_error(error_result)
-
-            return error_result
+    def _notify_generation_result(self, result: Dict[str, Any]):
+        """Invoke the completion or error callback for a generation result."""
+        if result["success"]:
+            if self.on_generation_complete:
+                self.on_generation_complete(result)
+        elif self.on_generation_error:
+            self.on_generation_error(result)
 
     def regenerate_blog_entry(
         self,
@@ -135,8 +159,8 @@ class BlogManager:
             if not existing_entry.filepath.exists():
                 raise BlogGenerationError(f"Blog entry file not found: {existing_entry.filepath}")
 
-            with open(existing_entry.filepath, 'r', encoding='utf-8') as f:
-                original_content = f.read()
+            # Only the frontmatter of the old entry feeds regeneration
+            original_content = self.generator.read_frontmatter_block(existing_entry.filepath)
 
             # Generate new content
             result = self.generator.regenerate_blog_entry(
@@ -188,26 +212,7 @@ class BlogManager:
     ) -> List[BlogEntry]:
         """Get blog entries with optional filtering."""
         try:
-            entries = self.storage.get_all_entries()
-
-            # Apply filters
-            if repository:
-                entries = [e for e in entries if e.repository == repository]
-
-            if provider:
-                entries = [e for e in entries if e.provider == provider]
-
-            # Sort by date (newest first)
-            entries.sort(key=lambda x: x.generated_at, reverse=True)
-
-            # Apply pagination
-            if offset:
-                entries = entries[offset:]
-
-            if limit:
-                entries = entries[:limit]
-
-            return entries
+            return self.storage.query_entries(repository, provider, offset, limit)
 
         except Exception as e:
             self.logger.error(f"Error getting blog entries: {e}")
@@ -291,47 +296,79 @@ class BlogManager:
         prompt: Optional[str] = None,
         provider: Optional[str] = None,
         max_tokens: Optional[int] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        concurrency: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Generate blog entries for multiple repositories."""
+        """Generate blog entries for multiple repositories concurrently, invoking callbacks on this thread."""
         results = {
             "total_repositories": len(repository_commits_map),
             "successful": 0,
             "failed": 0,
             "results": {}
         }
-
-        for repository, commits in repository_commits_map.items():
-            try:
-                result = self.generate_blog_from_commits(
-                    commits=commits,
-                    repository=repository,
-                    prompt=prompt,
-                    provider=provider,
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-
-                results["results"][repository] = result
-
-                if result["success"]:
-                    results["successful"] += 1
-                else:
-                    results["failed"] += 1
-
-            except Exception as e:
-                results["results"][repository] = {
-                    "success": False,
-                    "error": str(e)
-                }
-                results["failed"] += 1
-
+        if not repository_commits_map:
+            return results
+
+        completed = {}
+        max_workers = concurrency
+        if not max_workers:
+            max_workers = self.settings.get("blog.bulk_workers", 8)
+            # Stay within what the provider handles at once (e.g. one for a local Ollama server)
+            ai_provider = (
+                self.ai_manager.get_provider(provider) if provider
+                else self.ai_manager.get_active_provider()
+            )
+            if ai_provider is not None:
+                max_workers = min(max_workers, ai_provider.default_concurrency)
+        # Write the storage index once for the whole run instead of once per repository
+        with self.storage.batch():
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(repository_commits_map)))) as executor:
+                futures = {}
+                for repository, commits in repository_commits_map.items():
+                    if self.on_generation_start:
+                        self.on_generation_start(repository, len(commits))
+                    future = executor.submit(
+                        self._generate_and_store,
+                        commits=commits,
+                        repository=repository,
+                        prompt=prompt,
+                        provider=provider,
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                    futures[future] = repository
+
+                # Results are gathered on this thread, so the counters need no lock
+                # and the callbacks run where the caller expects them
+                for future in as_completed(futures):
+                    repository = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {
+                            "success": False,
+                            "error": str(e)
+                        }
+                    else:
+                        self._notify_generation_result(result)
+
+                    completed[repository] = result
+
+                    if result["success"]:
+                        results["successful"] += 1
+                    else:
+                        results["failed"] += 1
+
+        # Report in the caller's repository order rather than completion order
+        results["results"] = {repository: completed[repository] for repository in repository_commits_map}
         return results
 
     def get_recent_entries(self, limit: int = 10) -> List[BlogEntry]:
         """Get most recent blog entries."""
-        entries = self.get_blog_entries(limit=limit)
-        return entries[:limit]
+        # get_blog_entries treats a zero limit as "no limit"
+        if limit <= 0:
+            return []
+        return self.get_blog_entries(limit=limit)
 
     def get_popular_repositories(self, limit: int = 5) -> List[Tuple[str, int]]:
         """Get most popular repositories by entry count."""
@@ -355,47 +392,48 @@ class BlogManager:
         """Set the default prompt for blog generation."""
         self.settings.set_default_prompt(prompt)
 
-    def get_generation_history(self, repository: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get generation history."""
-        entries = self.get_blog_entries(repository=repository)
-
-        history = []
-        for entry in entries:
-            history.append({
-                "entry_id": f"{entry.generated_at.strftime('%Y%m%d_%H%M%S')}_{entry.repository.replace('/', '_')}",
-                "repository": entry.repository,
+    def iter_generation_history(self, repository: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield generation history records newest first, formatting each only when requested."""
+        for entry in self.get_blog_entries(repository=repository):
+            generated_at = entry.generated_at
+            entry_repository = entry.repository
+            yield {
+                "entry_id": f"{generated_at:%Y%m%d_%H%M%S}_{entry_repository.replace('/', '_')}",
+                "repository": entry_repository,
                 "title": entry.title,
                 "provider": entry.provider,
                 "model": entry.model,
                 "commit_count": entry.commit_count,
-                "generated_at": entry.generated_at.isoformat(),
+                "generated_at": generated_at.isoformat(),
                 "filepath": str(entry.filepath)
-            })
+            }
 
-        return history
+    def get_generation_history(self, repository: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get generation history."""
+        return list(self.iter_generation_history(repository))
 
     def backup_entries(self, backup_path: Path) -> Path:
         """Create a backup of all blog entries."""
         try:
             backup_path.mkdir(parents=True, exist_ok=True)
 
-            # Export as JSON
-            json_file = self.export_entries(backup_path, "json")
-
-            # Export as Markdown
-            md_file = self.export_entries(backup_path, "markdown")
+            # The JSON and Markdown exports write separate files, so run them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                json_future = executor.submit(self.export_entries, backup_path, "json")
+                md_future = executor.submit(self.export_entries, backup_path, "markdown")
+                json_file = json_future.result()
+                md_file = md_future.result()
 
             # Create backup info
             backup_info = {
                 "backup_created": datetime.now().isoformat(),
-                "total_entries": len(self.storage.get_all_entries()),
+                "total_entries": len(self.storage.entries),
                 "json_export": str(json_file),
                 "markdown_export": str(md_file)
             }
 
             info_file = backup_path / "backup_info.json"
             with open(info_file, 'w', encoding='utf-8') as f:
-                import json
                 json.dump(backup_info, f, indent=2, ensure_ascii=False)
 
             self.logger.info(f"Backup created at: {backup_path}")
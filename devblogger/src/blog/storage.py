@@ -5,13 +5,31 @@ DevBlogger - Blog File Management
 
 import logging
 import json
+from contextlib import contextmanager
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import shutil
 
 from ..config.settings import Settings
 
+try:
+    # Optional faster encoder for the blog index and the JSON export
+    import orjson
+
+    def _index_dumps(obj: Any) -> bytes:
+        """Serialize the blog index to indented JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _index_loads = orjson.loads
+except ImportError:
+    def _index_dumps(obj: Any) -> bytes:
+        """Serialize the blog index to indented JSON bytes."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+    _index_loads = json.loads
+
 
 class BlogStorageError(Exception):
     """Exception raised during blog storage operations."""
@@ -135,6 +153,14 @@ class BlogStorageManager:
         self.entries_dir = self.settings.get_generated_entries_dir()
         self.index_file = self.entries_dir / ".blog_index.json"
         self.entries: Dict[str, BlogEntry] = {}
+        # Entries sorted newest first, and the same order bucketed by repository
+        # and provider; all rebuilt lazily after the index changes
+        self._sorted_entries: Optional[List[BlogEntry]] = None
+        self._by_repository: Optional[Dict[str, List[BlogEntry]]] = None
+        self._by_provider: Optional[Dict[str, List[BlogEntry]]] = None
+        # While batching, index writes are deferred and flushed once at the end
+        self._batch_depth = 0
+        self._batch_dirty = False
 
         # Ensure directories exist
         self.entries_dir.mkdir(parents=True, exist_ok=True)
@@ -146,8 +172,7 @@ class BlogStorageManager:
         """Load blog entry index from file."""
         try:
             if self.index_file.exists():
-                with open(self.index_file, 'r', encoding='utf-8') as f:
-                    index_data = json.load(f)
+                index_data = _index_loads(self.index_file.read_bytes())
 
                 for entry_id, entry_data in index_data.items():
                     try:
@@ -155,19 +180,43 @@ class BlogStorageManager:
                     except Exception as e:
                         self.logger.warning(f"Failed to load entry {entry_id}: {e}")
 
+                self._invalidate_views()
+
         except Exception as e:
             self.logger.error(f"Error loading blog index: {e}")
 
+    def _invalidate_views(self):
+        """Drop derived views of the entries after the index changes."""
+        self._sorted_entries = None
+        self._by_repository = None
+        self._by_provider = None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer index writes made inside the block to a single write when it exits."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._save_index()
+
     def _save_index(self):
         """Save blog entry index to file."""
+        # Every mutation persists the index, so this is where derived views go stale
+        self._invalidate_views()
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
         try:
             index_data = {
                 entry_id: entry.to_dict()
                 for entry_id, entry in self.entries.items()
             }
 
-            with open(self.index_file, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
+            self.index_file.write_bytes(_index_dumps(index_data))
 
         except Exception as e:
             self.logger.error(f"Error saving blog index: {e}")
@@ -207,13 +256,63 @@ class BlogStorageManager:
         """Get all blog entries."""
         return list(self.entries.values())
 
+    def _get_sorted_entries(self) -> List[BlogEntry]:
+        """Get the shared newest-first entry list; callers must not modify it."""
+        if self._sorted_entries is None:
+            self._sorted_entries = sorted(self.entries.values(), key=lambda x: x.generated_at, reverse=True)
+        return self._sorted_entries
+
+    def _build_lookup_indexes(self):
+        """Bucket the newest-first entries by repository and by provider."""
+        by_repository: Dict[str, List[BlogEntry]] = {}
+        by_provider: Dict[str, List[BlogEntry]] = {}
+        for entry in self._get_sorted_entries():
+            by_repository.setdefault(entry.repository, []).append(entry)
+            by_provider.setdefault(entry.provider, []).append(entry)
+        self._by_repository = by_repository
+        self._by_provider = by_provider
+
+    def get_entries_newest_first(self) -> List[BlogEntry]:
+        """Get all blog entries sorted by generation date, newest first."""
+        return list(self._get_sorted_entries())
+
     def get_entries_by_repository(self, repository: str) -> List[BlogEntry]:
-        """Get all entries for a specific repository."""
-        return [entry for entry in self.entries.values() if entry.repository == repository]
+        """Get all entries for a specific repository, newest first."""
+        if self._by_repository is None:
+            self._build_lookup_indexes()
+        return list(self._by_repository.get(repository, ()))
 
     def get_entries_by_provider(self, provider: str) -> List[BlogEntry]:
-        """Get all entries generated by a specific provider."""
-        return [entry for entry in self.entries.values() if entry.provider == provider]
+        """Get all entries generated by a specific provider, newest first."""
+        if self._by_provider is None:
+            self._build_lookup_indexes()
+        return list(self._by_provider.get(provider, ()))
+
+    def query_entries(
+        self,
+        repository: Optional[str] = None,
+        provider: Optional[str] = None,
+        offset: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[BlogEntry]:
+        """Get a newest-first page of entries, copying only the requested slice."""
+        if repository or provider:
+            if self._by_repository is None:
+                self._build_lookup_indexes()
+            if repository:
+                view = self._by_repository.get(repository, ())
+            else:
+                view = self._by_provider.get(provider, ())
+        else:
+            view = self._get_sorted_entries()
+
+        start = max(offset or 0, 0)
+        stop = start + limit if limit and limit > 0 else None
+
+        if repository and provider:
+            matches = (entry for entry in view if entry.provider == provider)
+            return list(islice(matches, start, stop))
+        return list(view[start:stop])
 
     def get_entries_by_date_range(self, start_date: datetime, end_date: datetime) -> List[BlogEntry]:
         """Get entries within a date range."""
@@ -329,8 +428,7 @@ class BlogStorageManager:
                 }
 
                 export_file = export_path / "blog_entries_export.json"
-                with open(export_file, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2, ensure_ascii=False)
+                export_file.write_bytes(_index_dumps(export_data))
 
             elif format.lower() == "markdown":
                 # Export as a combined markdown file
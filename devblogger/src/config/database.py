@@ -7,10 +7,15 @@ import sqlite3
 import json
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 
 
+# Bounds for the gen_cache table; expired and surplus rows are pruned on every insert
+_GEN_CACHE_MAX_ENTRIES = 200
+_GEN_CACHE_MAX_AGE_DAYS = 30
+
+
 class DatabaseManager:
     """SQLite database manager for DevBlogger."""
 
@@ -83,6 +88,16 @@ class DatabaseManager:
                     )
                 ''')
 
+                # Create gen_cache table for previously returned AI responses
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS gen_cache (
+                        key TEXT PRIMARY KEY,
+                        content TEXT NOT NULL,
+                        metadata TEXT,      -- JSON string of generation metadata
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
                 # Create indexes for better performance
                 cursor.execute('''
                     CREATE INDEX IF NOT EXISTS idx_processed_commits_repo
@@ -124,6 +139,25 @@ class DatabaseManager:
             self.logger.error(f"Error checking processed commit: {e}")
             return False
 
+    def get_processed_shas(self, repo_name: str, commit_shas: List[str]) -> Set[str]:
+        """Return the subset of commit SHAs already processed for a repository."""
+        processed = set()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                # Stay well under SQLite's bound-parameter limit
+                for start in range(0, len(commit_shas), 500):
+                    chunk = commit_shas[start:start + 500]
+                    cursor.execute(
+                        "SELECT commit_sha FROM processed_commits WHERE repo_name = ? "
+                        f"AND commit_sha IN ({','.join('?' * len(chunk))})",
+                        (repo_name, *chunk)
+                    )
+                    processed.update(sha for (sha,) in cursor.fetchall())
+        except sqlite3.Error as e:
+            self.logger.error(f"Error checking processed commits: {e}")
+        return processed
+
     def mark_commit_processed(
         self,
         repo_name: str,
@@ -148,6 +182,26 @@ class DatabaseManager:
             self.logger.error(f"Error marking commit as processed: {e}")
             return False
 
+    def mark_commits_processed_bulk(
+        self,
+        repo_name: str,
+        commit_shas: List[str],
+        process_type: str = "both",
+        ai_provider: Optional[str] = None
+    ) -> bool:
+        """Mark several commits as processed in a single transaction."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO processed_commits
+                    (repo_name, commit_sha, process_type, ai_provider)
+                    VALUES (?, ?, ?, ?)
+                ''', [(repo_name, sha, process_type, ai_provider) for sha in commit_shas])
+                return True
+        except sqlite3.Error as e:
+            self.logger.error(f"Error marking commits as processed: {e}")
+            return False
+
     def mark_commit_unprocessed(self, repo_name: str, commit_sha: str, process_type: str = "both") -> bool:
         """Mark a commit as unprocessed for specific type."""
         try:
@@ -296,6 +350,45 @@ class DatabaseManager:
             self.logger.error(f"Error getting database value: {e}")
             return default
 
+    def get_cached_generation(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve previously generated content and metadata by cache key."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT content, metadata FROM gen_cache WHERE key = ?", (key,))
+                row = cursor.fetchone()
+                if row:
+                    return {"content": row[0], "metadata": json.loads(row[1]) if row[1] else {}}
+                return None
+        except (sqlite3.Error, ValueError) as e:
+            self.logger.error(f"Error retrieving cached generation: {e}")
+            return None
+
+    def cache_generation(self, key: str, content: str, metadata: Dict[str, Any]) -> bool:
+        """Store generated content and metadata under a cache key, pruning expired and surplus rows."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO gen_cache (key, content, metadata)
+                    VALUES (?, ?, ?)
+                ''', (key, content, json.dumps(metadata)))
+                cursor.execute(
+                    "DELETE FROM gen_cache WHERE created_at < datetime('now', '-' || ? || ' days')",
+                    (_GEN_CACHE_MAX_AGE_DAYS,)
+                )
+                # INSERT OR REPLACE assigns a fresh rowid, so rowid order is insertion order
+                cursor.execute('''
+                    DELETE FROM gen_cache WHERE rowid NOT IN (
+                        SELECT rowid FROM gen_cache ORDER BY rowid DESC LIMIT ?
+                    )
+                ''', (_GEN_CACHE_MAX_ENTRIES,))
+                conn.commit()
+                return True
+        except (sqlite3.Error, TypeError) as e:
+            self.logger.error(f"Error caching generation: {e}")
+            return False
+
     def cleanup_old_records(self, days_old: int = 30):
         """Clean up old processed commit records."""
         try:
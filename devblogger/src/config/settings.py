@@ -6,12 +6,15 @@ DevBlogger - Application settings and configuration
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 
 
 class Settings:
     """Application settings manager."""
 
+    _cached_instance: Optional["Settings"] = None
+    _cached_mtime: Optional[float] = None
+
     def __init__(self, config_file: Optional[str] = None):
         """Initialize settings with optional config file path."""
         if config_file is None:
@@ -27,6 +30,36 @@ class Settings:
 
         self._load_settings()
 
+    @classmethod
+    def get_cached(cls, config_file: Optional[str] = None) -> "Settings":
+        """Get a shared settings instance, re-parsing only when the config file changes."""
+        if config_file is None:
+            config_path = Path.home() / ".devblogger" / "config.json"
+        else:
+            config_path = Path(config_file)
+
+        try:
+            mtime = os.stat(config_path).st_mtime
+        except OSError:
+            mtime = None
+
+        cached = cls._cached_instance
+        if (
+            cached is not None
+            and mtime is not None
+            and cached.config_file == config_path
+            and cls._cached_mtime == mtime
+        ):
+            return cached
+
+        instance = cls(config_file)
+        try:
+            cls._cached_mtime = os.stat(instance.config_file).st_mtime
+        except OSError:
+            cls._cached_mtime = None
+        cls._cached_instance = instance
+        return instance
+
     def _get_default_settings(self) -> Dict[str, Any]:
         """Get default application settings."""
         return {
@@ -86,6 +119,7 @@ class Settings:
                 "include_commit_hashes": True,
                 "include_timestamps": True,
                 "auto_save": True,
+                "bulk_workers": 8,
             },
         }
 
@@ -137,6 +171,10 @@ class Settings:
         except (KeyError, TypeError):
             return default
 
+    def get_many(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """Get several setting values at once using dot notation."""
+        return {key: self.get(key, default) for key in keys}
+
     def set(self, key: str, value: Any):
         """Set a setting value using dot notation (e.g., 'app.name')."""
         keys = key.split('.')
@@ -207,6 +245,9 @@ class Settings:
     def set_ai_provider_config(self, provider: str, config: Dict[str, Any]):
         """Set configuration for a specific AI provider."""
         providers = self.get("ai.providers", {})
+        if providers.get(provider) == config:
+            # Unchanged; skip rewriting the config file
+            return
         providers[provider] = config
         self.set("ai.providers", providers)
 
@@ -33,6 +33,7 @@ def CTkMessagebox(title, message, icon="info", **kwargs):
         print(message)
         print("=" * (len(title) + 4))
 
+from ..ai.base import run_sync
 from ..ai.manager import DevBloggerAIProviderManager
 from ..github.models import GitHubCommit
 from ..config.settings import Settings
@@ -626,29 +627,18 @@ class BlogEditor(ctk.CTkFrame):
                     self.after(0, lambda: self._handle_generation_success(response_text))
                     
                 except AttributeError:
-                    # Fallback to async method if sync not available
-                    import asyncio
-                    
-                    # Create new event loop for this thread
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        # Compose final prompt (use custom if provided)
-                        full_prompt = self.custom_full_prompt if getattr(self, "custom_full_prompt", None) else f"{prompt}\n\nCommit Data:\n{commit_data}"
-                        response = loop.run_until_complete(
-                            self.ai_manager.generate_with_active(
-                                prompt=full_prompt,
-                                max_tokens=2000,
-                                temperature=0.7
-                            )
+                    # Fallback to async method if sync not available, run on the shared loop
+                    full_prompt = self.custom_full_prompt if getattr(self, "custom_full_prompt", None) else f"{prompt}\n\nCommit Data:\n{commit_data}"
+                    response = run_sync(
+                        self.ai_manager.generate_with_active(
+                            prompt=full_prompt,
+                            max_tokens=2000,
+                            temperature=0.7
                         )
-                        
-                        # Update editor with generated content
-                        self.after(0, lambda: self._handle_generation_success(response.text))
-                        
-                    finally:
-                        loop.close()
+                    )
+
+                    # Update editor with generated content
+                    self.after(0, lambda: self._handle_generation_success(response.text))
 
             except Exception as e:
                 error_msg = str(e)
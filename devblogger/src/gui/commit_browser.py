@@ -815,7 +815,7 @@ class CommitBrowser(ctk.CTkFrame):
             author_name = author_name[:17] + "..."
 
         # Short message
-        message = commit.message.split('\n')[0]  # First line only
+        message = commit.message.partition('\n')[0]  # First line only
         if len(message) > 60:
             message = message[:57] + "..."
 
@@ -835,7 +835,7 @@ class CommitBrowser(ctk.CTkFrame):
         author_name = commit.author.name or commit.author.login or "Unknown"
         if len(author_name) > 20:
             author_name = author_name[:17] + "..."
-        message = commit.message.split('\n')[0]
+        message = commit.message.partition('\n')[0]
         if len(message) > 60:
             message = message[:57] + "..."
         date_str = commit.date.strftime("%m/%d %H:%M") if commit.date else "Unknown"
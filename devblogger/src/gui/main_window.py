@@ -1704,6 +1704,12 @@ class MainWindow(ctk.CTk):
         if self.github_client:
             self.github_client.close()
 
+        # Close AI provider sessions
+        try:
+            self.ai_manager.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing AI providers: {e}")
+
         # Destroy window
         self.destroy()
 
@@ -3,13 +3,16 @@
 DevBlogger - AI Integration Tests
 """
 
+import asyncio
 import pytest
 import tempfile
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
 from src.ai.manager import DevBloggerAIProviderManager
-from src.ai.base import AIResponse
+from src.ai.base import AIProvider, AIProviderManager, AIResponse, run_sync
+from src.ai.gemini_client import GeminiProvider
+from src.ai.ollama_client import OllamaProvider, _estimate_tokens
 from src.config.settings import Settings
 from src.config.database import DatabaseManager
 
@@ -123,6 +126,186 @@ class TestAIResponse:
         assert response.metadata == metadata
 
 
+class StubProvider(AIProvider):
+    """Minimal provider counting connection probes."""
+
+    def __init__(self):
+        super().__init__("stub", "stub-model")
+        self.probes = 0
+
+    def is_configured(self):
+        return True
+
+    def test_connection(self):
+        self.probes += 1
+        return True
+
+    async def generate_text(self, prompt, max_tokens=None, temperature=None, **kwargs):
+        return AIResponse(prompt, self.model, self.name)
+
+    def get_available_models(self):
+        return [self.model]
+
+    def get_model_info(self, model):
+        return {"name": model}
+
+
+class TestAIProviderBase:
+    """Test shared AIProvider behaviour."""
+
+    def test_connection_result_is_cached(self):
+        """Test connection probes are reused until invalidated."""
+        provider = StubProvider()
+
+        assert provider.test_connection_cached()
+        assert provider.test_connection_cached()
+        assert provider.probes == 1
+
+        provider.invalidate_connection_cache()
+        assert provider.test_connection_cached()
+        assert provider.probes == 2
+
+        # A model change is never served from the old cache entry
+        provider.model = "other-model"
+        provider.test_connection_cached()
+        assert provider.probes == 3
+
+    def test_refresh_connection_status(self):
+        """Test refreshing the connection status updates the cached result."""
+        provider = StubProvider()
+        assert run_sync(provider.refresh_connection_status())
+        assert provider.test_connection_cached()
+        assert provider.probes == 1
+
+    def test_generate_sync(self):
+        """Test synchronous generation through the background loop."""
+        assert StubProvider().generate_sync("hello") == "hello"
+
+    def test_response_cache_key(self):
+        """Test only deterministic requests are cached unless asked otherwise."""
+        provider = StubProvider()
+        assert provider._response_cache_key("hi", 100, 0.7, None, {}) is None
+        assert provider._response_cache_key("hi", 100, 0.7, True, {}) is not None
+        assert provider._response_cache_key("hi", 100, 0, None, {}) is not None
+        assert provider._response_cache_key("hi", 100, 0, False, {}) is None
+
+    def test_generate_many(self):
+        """Test batched generation keeps prompt order."""
+        responses = run_sync(StubProvider().generate_many(["a", "b", "c"], concurrency=2))
+        assert [response.text for response in responses] == ["a", "b", "c"]
+
+    def test_max_context_tokens_follows_model(self):
+        """Test the context window comes from the configured model's info."""
+        provider = StubProvider()
+        assert provider.max_context_tokens() == 4096
+
+        with patch.object(provider, "get_model_info", return_value={"context_length": 128000}) as info:
+            assert provider.max_context_tokens() == 128000
+            info.assert_called_once_with("stub-model")
+
+    def test_generic_apply_config(self):
+        """Test the base apply_config sets known attributes and drops cached probes."""
+        provider = StubProvider()
+        assert provider.test_connection_cached()
+
+        provider.apply_config({"model": "other-model", "unknown_option": 1})
+        assert provider.model == "other-model"
+        assert not hasattr(provider, "unknown_option")
+        assert provider.test_connection_cached()
+        assert provider.probes == 2
+
+    def test_generate_with_active_sees_later_configuration(self):
+        """Test a provider configured after registration can generate without reconfigure()."""
+        provider = StubProvider()
+        provider.is_configured = lambda: False
+        manager = AIProviderManager()
+        manager.register_provider(provider)
+        manager.set_active_provider("stub")
+
+        with pytest.raises(ValueError):
+            run_sync(manager.generate_with_active("hello"))
+
+        provider.is_configured = lambda: True
+        assert run_sync(manager.generate_with_active("hello")).text == "hello"
+
+    def test_default_text_stream(self):
+        """Test providers without streaming yield the whole response once."""
+        async def collect():
+            return [chunk async for chunk in StubProvider().generate_text_stream("hello")]
+
+        assert run_sync(collect()) == ["hello"]
+
+
+class TestOllamaProvider:
+    """Test Ollama provider session and model list handling."""
+
+    def test_session_from_previous_loop_is_closed(self):
+        """Test switching event loops closes the session left on the old loop."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = OllamaProvider(Settings(str(Path(temp_dir) / "config.json")))
+
+            # The old loop is closed by the time the new session is made
+            first = asyncio.run(provider._get_session())
+            second = asyncio.run(provider._get_session())
+            assert first.closed
+            assert not second.closed
+
+            # The old loop is still running elsewhere, so close() is scheduled on it
+            third = run_sync(provider._get_session())
+            assert second.closed
+            asyncio.run(provider._get_session())
+            run_sync(asyncio.sleep(0.05))
+            assert third.closed
+
+            asyncio.run(provider.aclose())
+
+    def test_estimate_tokens(self):
+        """Test token estimates count whitespace-separated words."""
+        assert _estimate_tokens("") == 0
+        assert _estimate_tokens("   ") == 0
+        assert _estimate_tokens("one two\nthree\tfour  five") == 5
+
+    def test_cached_models(self):
+        """Test cached models come from the last listing for the current server."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            provider = OllamaProvider(Settings(str(Path(temp_dir) / "config.json")))
+            assert provider.get_cached_models() == []
+
+            provider._models_cache = (0.0, provider.base_url, ["llama3.1:latest"])
+            assert provider.get_cached_models() == ["llama3.1:latest"]
+
+            provider.base_url = "http://other:11434"
+            assert provider.get_cached_models() == []
+
+
+class TestGeminiProvider:
+    """Test Gemini provider model catalog caching."""
+
+    def test_model_list_cleared_on_config_change(self):
+        """Test the model catalog is reused until the configuration changes."""
+        fake_genai = Mock()
+        fake_genai.list_models.return_value = [Mock(), Mock()]
+        fake_genai.list_models.return_value[0].name = "models/gemini-pro"
+        fake_genai.list_models.return_value[1].name = "models/text-bison"
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch("src.ai.gemini_client.genai", fake_genai), \
+                patch("src.ai.gemini_client.GENAI_AVAILABLE", True):
+            provider = GeminiProvider(Settings(str(Path(temp_dir) / "config.json")))
+            provider.update_config("key-1", "gemini-pro")
+            assert provider.get_cached_models() == []
+
+            assert provider.get_available_models() == ["gemini-pro"]
+            assert provider.get_available_models() == ["gemini-pro"]
+            assert provider.get_cached_models() == ["gemini-pro"]
+            assert fake_genai.list_models.call_count == 1
+
+            provider.update_config("key-2", "gemini-pro")
+            assert provider.get_cached_models() == []
+            provider.get_available_models()
+            assert fake_genai.list_models.call_count == 2
+
+
 class TestAIProviderIntegration:
     """Test AI provider integration with mocking."""
 
@@ -3,8 +3,10 @@
 DevBlogger - Blog Generation Tests
 """
 
+import json
 import pytest
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -13,7 +15,7 @@ from src.blog.generator import BlogGenerator, BlogGenerationError
 from src.blog.storage import BlogStorageManager, BlogEntry, BlogStorageError
 from src.blog.manager import BlogManager
 from src.ai.manager import DevBloggerAIProviderManager
-from src.ai.base import AIResponse
+from src.ai.base import AIResponse, run_sync
 from src.github.models import GitHubCommit, GitHubUser
 from src.config.settings import Settings
 from src.config.database import DatabaseManager
@@ -159,6 +161,161 @@ class TestBlogGenerator:
             assert stats["additions"] == 15
             assert stats["deletions"] == 3
 
+    def test_generate_blog_entries_batch(self):
+        """Test concurrent batch generation keeps job order and reports failures."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Settings(str(Path(temp_dir) / "config.json"))
+            db = DatabaseManager(db_path=str(Path(temp_dir) / "test.db"))
+
+            async def fake_generate(prompt, max_tokens=None, temperature=None, **kwargs):
+                return AIResponse(text="# Entry\n\nBody", model="stub-model", provider="stub")
+
+            ai_provider = Mock(max_tokens=2000)
+            ai_provider.max_context_tokens.return_value = 8192
+            ai_provider.is_configured.return_value = True
+            ai_provider.generate_text = fake_generate
+            ai_manager = Mock()
+            ai_manager.get_provider.return_value = ai_provider
+
+            generator = BlogGenerator(ai_manager, settings, db)
+            commit = GitHubCommit(
+                sha="abc123",
+                message="Add feature",
+                author=GitHubUser(login="test", id=1, name="Test"),
+                committer=GitHubUser(login="test", id=1, name="Test"),
+                date=datetime.now()
+            )
+            jobs = [
+                {"commits": [commit], "repository": "test/repo", "provider": "stub"},
+                {"commits": [], "repository": "test/repo", "provider": "stub"},
+            ]
+
+            results = run_sync(generator.generate_blog_entries_batch(jobs, max_concurrency=2))
+
+            assert results[0]["success"]
+            assert results[0]["metadata"]["model"] == "stub-model"
+            assert isinstance(results[1], BlogGenerationError)
+            assert db.is_commit_processed("test/repo", "abc123")
+
+    def test_regenerate_many(self):
+        """Test regenerating with several providers maps each to its own result."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Settings(str(Path(temp_dir) / "config.json"))
+            db = DatabaseManager(db_path=str(Path(temp_dir) / "test.db"))
+
+            def make_provider(name):
+                async def fake_generate(prompt, max_tokens=None, temperature=None, **kwargs):
+                    return AIResponse(text=f"# From {name}", model=f"{name}-model", provider=name)
+
+                provider = Mock(max_tokens=2000)
+                provider.max_context_tokens.return_value = 8192
+                provider.is_configured.return_value = name != "gemini"
+                provider.generate_text = fake_generate
+                return provider
+
+            providers = {name: make_provider(name) for name in ("chatgpt", "gemini", "ollama")}
+            ai_manager = Mock()
+            ai_manager.get_provider.side_effect = providers.get
+
+            generator = BlogGenerator(ai_manager, settings, db)
+            commit = GitHubCommit(
+                sha="abc123",
+                message="Add feature",
+                author=GitHubUser(login="test", id=1, name="Test"),
+                committer=GitHubUser(login="test", id=1, name="Test"),
+                date=datetime.now()
+            )
+
+            results = run_sync(generator.regenerate_many([commit], "test/repo", list(providers), prompt="Write"))
+
+            assert "From chatgpt" in results["chatgpt"]["content"]
+            assert results["ollama"]["metadata"]["model"] == "ollama-model"
+            assert isinstance(results["gemini"], BlogGenerationError)
+
+    def test_commit_data_token_budget(self):
+        """Test commit data stops at the token budget but keeps the first commit."""
+        generator = BlogGenerator(Mock(), Mock(), Mock())
+        commits = [
+            GitHubCommit(
+                sha=f"sha{i}",
+                message="Change " * 20,
+                author=GitHubUser(login="test", id=1, name="Test"),
+                committer=GitHubUser(login="test", id=1, name="Test"),
+                date=datetime.now()
+            )
+            for i in range(20)
+        ]
+
+        full = generator._prepare_commit_data(commits, "test/repo")
+        assert "truncated" not in full
+
+        limited = generator._prepare_commit_data(commits, "test/repo", token_budget=100)
+        assert "sha0" in limited
+        assert "sha19" not in limited
+        assert "more commits truncated" in limited
+        assert len(limited) < len(full)
+
+        single = generator._prepare_commit_data(commits, "test/repo", token_budget=0)
+        assert "sha0" in single
+        assert "19 more commits truncated" in single
+
+    def test_generation_cache(self):
+        """Test only deterministic or opted-in generations reuse the cached AI response."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Settings(str(Path(temp_dir) / "config.json"))
+            db = DatabaseManager(db_path=str(Path(temp_dir) / "test.db"))
+            calls = []
+
+            async def fake_generate(prompt, max_tokens=None, temperature=None, **kwargs):
+                calls.append(prompt)
+                return AIResponse(text=f"# Entry {len(calls)}", model="stub-model", provider="stub")
+
+            ai_provider = Mock(model="stub-model", max_tokens=2000, temperature=0.7)
+            ai_provider.max_context_tokens.return_value = 8192
+            ai_provider.is_configured.return_value = True
+            ai_provider.generate_text = fake_generate
+            ai_manager = Mock()
+            ai_manager.get_provider.return_value = ai_provider
+
+            generator = BlogGenerator(ai_manager, settings, db)
+            commit = GitHubCommit(
+                sha="abc123",
+                message="Add feature",
+                author=GitHubUser(login="test", id=1, name="Test"),
+                committer=GitHubUser(login="test", id=1, name="Test"),
+                date=datetime.now()
+            )
+
+            # Sampling at the provider's default temperature always generates again
+            generator.generate_blog_entry([commit], "test/repo", prompt="Write", provider="stub")
+            generator.generate_blog_entry([commit], "test/repo", prompt="Write", provider="stub")
+            assert len(calls) == 2
+
+            first = generator.generate_blog_entry([commit], "test/repo", prompt="Write", provider="stub", temperature=0)
+            second = generator.generate_blog_entry([commit], "test/repo", prompt="Write", provider="stub", temperature=0)
+            assert len(calls) == 3
+            assert second["metadata"]["cached"]
+            assert "Entry 3" in second["content"]
+            # Cache hits are stamped with a fresh timestamp of their own
+            assert second["metadata"]["generated_at_dt"] >= first["metadata"]["generated_at_dt"]
+            assert f"generated_at: {second['metadata']['generated_at_dt'].isoformat(' ', 'seconds')}" in second["content"]
+
+            opted_in = generator.generate_blog_entry([commit], "test/repo", prompt="Write", provider="stub", use_cache=True)
+            assert len(calls) == 3
+            assert "Entry 2" in opted_in["content"]
+
+            # A new configured max_tokens is a different generation, not a cache hit
+            ai_provider.max_tokens = 1000
+            generator.generate_blog_entry([commit], "test/repo", prompt="Write", provider="stub", temperature=0)
+            assert len(calls) == 4
+            ai_provider.max_tokens = 2000
+
+            forced = generator.generate_blog_entry(
+                [commit], "test/repo", prompt="Write", provider="stub", temperature=0, force=True
+            )
+            assert len(calls) == 5
+            assert "Entry 5" in forced["content"]
+
 
 class TestBlogStorageManager:
     """Test Blog Storage Manager functionality."""
@@ -306,6 +463,114 @@ class TestBlogStorageManager:
             assert stats["repositories"]["repo2"] == 1
             assert stats["providers"]["chatgpt"] == 2
 
+    def test_entries_newest_first(self):
+        """Test the sorted entry view follows additions, updates and deletions."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            storage = BlogStorageManager(settings)
+
+            def make_entry(repository, day):
+                return BlogEntry(
+                    filepath=Path(temp_dir) / f"{repository}.md",
+                    repository=repository,
+                    commit_count=1,
+                    provider="ollama",
+                    model="llama3",
+                    generated_at=datetime(2024, 1, day)
+                )
+
+            old_id = storage.add_entry(make_entry("old", 1))
+            storage.add_entry(make_entry("new", 3))
+            assert [e.repository for e in storage.get_entries_newest_first()] == ["new", "old"]
+
+            storage.update_entry(old_id, {"generated_at": datetime(2024, 1, 5)})
+            assert [e.repository for e in storage.get_entries_newest_first()] == ["old", "new"]
+
+            storage.delete_entry(old_id)
+            assert [e.repository for e in storage.get_entries_newest_first()] == ["new"]
+
+    def test_batched_index_writes(self):
+        """Test index writes inside a batch are flushed once at the end."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            storage = BlogStorageManager(settings)
+
+            with patch.object(storage.index_file.__class__, "write_bytes", autospec=True) as write_bytes:
+                with storage.batch():
+                    for day in (1, 2):
+                        storage.add_entry(BlogEntry(
+                            filepath=Path(temp_dir) / f"{day}.md",
+                            repository=f"repo{day}",
+                            commit_count=1,
+                            provider="ollama",
+                            model="model",
+                            generated_at=datetime(2024, 1, day)
+                        ))
+                    assert write_bytes.call_count == 0
+                    assert len(storage.get_entries_newest_first()) == 2
+
+                assert write_bytes.call_count == 1
+
+    def test_entry_lookup_indexes(self):
+        """Test repository and provider lookups stay current and newest first."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            storage = BlogStorageManager(settings)
+
+            for day, (repository, provider) in enumerate(
+                [("repo1", "chatgpt"), ("repo2", "ollama"), ("repo1", "ollama")], start=1
+            ):
+                storage.add_entry(BlogEntry(
+                    filepath=Path(temp_dir) / f"{day}.md",
+                    repository=repository,
+                    commit_count=1,
+                    provider=provider,
+                    model="model",
+                    generated_at=datetime(2024, 1, day)
+                ))
+
+            repo1 = storage.get_entries_by_repository("repo1")
+            assert [e.generated_at.day for e in repo1] == [3, 1]
+            assert [e.repository for e in storage.get_entries_by_provider("ollama")] == ["repo1", "repo2"]
+            assert storage.get_entries_by_repository("missing") == []
+
+            # Returned lists are copies, and updates are picked up
+            repo1.clear()
+            entry_id = next(i for i, e in storage.entries.items() if e.generated_at.day == 1)
+            storage.update_entry(entry_id, {"provider": "ollama"})
+            assert len(storage.get_entries_by_repository("repo1")) == 2
+            assert len(storage.get_entries_by_provider("ollama")) == 3
+
+    def test_query_entries(self):
+        """Test paged entry queries with repository and provider filters."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            storage = BlogStorageManager(settings)
+
+            for day in range(1, 7):
+                storage.add_entry(BlogEntry(
+                    filepath=Path(temp_dir) / f"{day}.md",
+                    repository="repo1" if day % 2 else "repo2",
+                    commit_count=1,
+                    provider="ollama" if day % 3 else "gemini",
+                    model="model",
+                    generated_at=datetime(2024, 1, day)
+                ))
+
+            def days(entries):
+                return [e.generated_at.day for e in entries]
+
+            assert days(storage.query_entries()) == [6, 5, 4, 3, 2, 1]
+            assert days(storage.query_entries(offset=1, limit=2)) == [5, 4]
+            assert days(storage.query_entries(repository="repo1", limit=2)) == [5, 3]
+            assert days(storage.query_entries(provider="gemini")) == [6, 3]
+            assert days(storage.query_entries(repository="repo1", provider="ollama", offset=1)) == [1]
+            assert storage.query_entries(repository="missing") == []
+
 
 class TestBlogManager:
     """Test Blog Manager functionality."""
@@ -456,6 +721,97 @@ class TestBlogManager:
             stats = manager.get_storage_stats()
             assert stats["total_entries"] == 0
 
+    def test_bulk_generation(self):
+        """Test bulk generation runs repositories concurrently and keeps their order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            manager = BlogManager(Mock(), settings, Mock())
+
+            barrier = threading.Barrier(3, timeout=5)
+
+            def fake_generate(commits, repository, **kwargs):
+                # Only passes if all three repositories are in flight at once
+                barrier.wait()
+                if repository == "org/broken":
+                    raise RuntimeError("boom")
+                return {"success": True, "repository": repository}
+
+            repos = {"org/a": [], "org/broken": [], "org/c": []}
+            with patch.object(manager, "_generate_and_store", side_effect=fake_generate):
+                results = manager.bulk_generate_blogs(repos, concurrency=3)
+
+            assert list(results["results"]) == list(repos)
+            assert results["successful"] == 2
+            assert results["failed"] == 1
+            assert results["results"]["org/broken"] == {"success": False, "error": "boom"}
+
+    def test_bulk_generation_respects_provider_concurrency(self):
+        """Test bulk generation runs no more jobs at once than the provider allows."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            settings.get.return_value = 8
+            ai_manager = Mock()
+            ai_manager.get_provider.return_value = Mock(default_concurrency=1)
+            manager = BlogManager(ai_manager, settings, Mock())
+
+            lock = threading.Lock()
+            running = []
+            peak = []
+
+            def fake_generate(commits, repository, **kwargs):
+                with lock:
+                    running.append(repository)
+                    peak.append(len(running))
+                threading.Event().wait(0.01)
+                with lock:
+                    running.remove(repository)
+                return {"success": True}
+
+            repos = {"org/a": [], "org/b": [], "org/c": []}
+            with patch.object(manager, "_generate_and_store", side_effect=fake_generate):
+                results = manager.bulk_generate_blogs(repos, provider="ollama")
+
+            assert results["successful"] == 3
+            assert max(peak) == 1
+            ai_manager.get_provider.assert_called_with("ollama")
+
+    def test_bulk_generation_callbacks_on_calling_thread(self):
+        """Test bulk generation invokes the event callbacks on the calling thread."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir)
+            manager = BlogManager(Mock(), settings, Mock())
+
+            callback_threads = []
+            manager.on_generation_start = lambda repository, count: callback_threads.append(threading.get_ident())
+            manager.on_generation_complete = lambda result: callback_threads.append(threading.get_ident())
+            manager.on_generation_error = lambda result: callback_threads.append(threading.get_ident())
+
+            def fake_generate(commits, repository, **kwargs):
+                return {"success": repository != "org/broken"}
+
+            repos = {"org/a": [], "org/broken": []}
+            with patch.object(manager, "_generate_and_store", side_effect=fake_generate):
+                manager.bulk_generate_blogs(repos, concurrency=2)
+
+            assert callback_threads == [threading.get_ident()] * 4
+
+    def test_backup_entries(self):
+        """Test backup writes both exports and the backup info file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Mock()
+            settings.get_generated_entries_dir.return_value = Path(temp_dir) / "entries"
+            manager = BlogManager(Mock(), settings, Mock())
+
+            backup_dir = manager.backup_entries(Path(temp_dir) / "backup")
+
+            assert (backup_dir / "blog_entries_export.json").exists()
+            assert (backup_dir / "blog_entries_export.md").exists()
+            info = json.loads((backup_dir / "backup_info.json").read_text(encoding="utf-8"))
+            assert info["total_entries"] == 0
+
 
 def test_blog_entry_from_file():
     """Test creating blog entry from file."""
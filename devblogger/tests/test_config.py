@@ -6,8 +6,10 @@ DevBlogger - Configuration Tests
 import pytest
 import tempfile
 import json
+import os
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 from src.config.settings import Settings
 from src.config.database import DatabaseManager
@@ -70,6 +72,47 @@ class TestSettings:
             settings2 = Settings(config_dir=temp_dir)
             assert settings2.get_active_ai_provider() == "gemini"
 
+    def test_cached_settings(self):
+        """Test cached settings are reused until the config file changes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = str(Path(temp_dir) / "config.json")
+
+            settings = Settings.get_cached(config_file)
+            assert Settings.get_cached(config_file) is settings
+
+            # Rewrite the file with a different mtime
+            settings.set("github.client_id", "new-id")
+            path = Path(config_file)
+            stat = path.stat()
+            os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+            reloaded = Settings.get_cached(config_file)
+            assert reloaded is not settings
+            assert reloaded.get("github.client_id") == "new-id"
+
+    def test_get_many(self):
+        """Test fetching several settings at once."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings = Settings(str(Path(temp_dir) / "config.json"))
+
+            values = settings.get_many(["github.scope", "github.missing"])
+            assert values == {"github.scope": "read:user repo", "github.missing": None}
+
+    def test_unchanged_provider_config_not_rewritten(self):
+        """Test re-applying the same provider config leaves the file untouched."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.json"
+            settings = Settings(str(config_file))
+            config = {"base_url": "http://localhost:11434", "model": "llama2"}
+
+            settings.set_ai_provider_config("ollama", config)
+            mtime = config_file.stat().st_mtime_ns
+            os.utime(config_file, ns=(mtime - 10**9, mtime - 10**9))
+
+            settings.set_ai_provider_config("ollama", dict(config))
+            assert config_file.stat().st_mtime_ns == mtime - 10**9
+            assert settings.get_ai_provider_config("ollama") == config
+
 
 class TestDatabaseManager:
     """Test DatabaseManager class functionality."""
@@ -96,6 +139,45 @@ class TestDatabaseManager:
             assert db.is_commit_processed("test/repo", "abc123") == True
             assert db.is_commit_processed("test/repo", "def456") == False
 
+    def test_bulk_commit_processing(self):
+        """Test marking several commits as processed at once."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            db = DatabaseManager(db_path=str(db_path))
+
+            assert db.mark_commits_processed_bulk("test/repo", ["abc123", "def456"], ai_provider="ollama")
+            assert db.mark_commits_processed_bulk("test/repo", ["abc123"], ai_provider="gemini")
+
+            assert db.is_commit_processed("test/repo", "abc123")
+            assert db.is_commit_processed("test/repo", "def456")
+            assert len(db.get_processed_commits("test/repo")) == 2
+
+    def test_processed_shas_lookup(self):
+        """Test looking up processed commits in one query."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            db = DatabaseManager(db_path=str(db_path))
+
+            db.mark_commits_processed_bulk("test/repo", ["abc123", "def456"])
+            db.mark_commits_processed_bulk("other/repo", ["ghi789"])
+
+            shas = ["abc123", "ghi789"] + [f"sha{i}" for i in range(600)]
+            assert db.get_processed_shas("test/repo", shas) == {"abc123"}
+            assert db.get_processed_shas("test/repo", []) == set()
+
+    def test_generation_cache_is_bounded(self):
+        """Test the generation cache keeps only the newest entries."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = Path(temp_dir) / "test.db"
+            db = DatabaseManager(db_path=str(db_path))
+
+            with patch("src.config.database._GEN_CACHE_MAX_ENTRIES", 2):
+                for key in ("a", "b", "c"):
+                    assert db.cache_generation(key, f"text {key}", {"model": "m"})
+
+            assert db.get_cached_generation("a") is None
+            assert db.get_cached_generation("c") == {"content": "text c", "metadata": {"model": "m"}}
+
     def test_processed_commits_query(self):
         """Test querying processed commits."""
         with tempfile.TemporaryDirectory() as temp_dir: